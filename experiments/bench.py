@@ -5,16 +5,16 @@ Mide el tiempo de ejecución y el número de pasos para diferentes tamaños de e
 
 import sys
 import os
-import time
 import json
+import random
+import argparse
 from typing import List, Dict
 
 # Agregar el directorio src al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.loader import load_machine
-from src.tape import Tape
-from src.machine import TuringMachine
+from src.loader import load_machine, MachineDef
+from experiments.timing import time_run
 
 def generate_inputs_fibonacci(min_n: int = 5, max_n: int = 20) -> List[tuple]:
     """
@@ -27,7 +27,67 @@ def generate_inputs_fibonacci(min_n: int = 5, max_n: int = 20) -> List[tuple]:
         inputs.append((n, input_str))
     return inputs
 
-def benchmark_machine(machine_path: str, inputs: List[tuple], max_steps: int = 100000) -> List[Dict]:
+def generate_inputs_unary(min_n: int = 5, max_n: int = 20, symbol: str = "1") -> List[tuple]:
+    """
+    Genera entradas unarias con cualquier símbolo: (n, symbol * n)
+    """
+    return [(n, symbol * n) for n in range(min_n, max_n + 1)]
+
+def generate_inputs_random(min_n: int = 5, max_n: int = 20, alphabet: str = "01", seed: int = 0) -> List[tuple]:
+    """
+    Genera una entrada aleatoria de largo n sobre `alphabet` para cada n
+    """
+    rng = random.Random(seed)
+    return [(n, "".join(rng.choice(alphabet) for _ in range(n))) for n in range(min_n, max_n + 1)]
+
+def benchmark_input(machine_def: MachineDef, n: int, input_str: str, max_steps: int = 100000,
+                    engine: str = "basic", max_time: float = 600.0, tape: str = "dict", **harness) -> Dict:
+    """
+    Mide una sola entrada con el harness de experiments/timing.py y retorna
+    el diccionario de resultados (el formato de benchmark_results.json)
+    """
+    timing = time_run(machine_def, input_str, engine=engine, tape=tape,
+                      max_steps=max_steps, max_time=max_time, **harness)
+    result = timing["result"]
+    run = timing["run"]
+
+    # time_ms/time_s son la mediana, los usa plot.py
+    return {
+        'n': n,
+        'input_size': len(input_str),
+        'input': input_str,
+        'steps': result.steps,
+        'time_ms': run["median"] * 1000,
+        'time_s': run["median"],
+        'time_mean_ms': run["mean"] * 1000,
+        'time_iqr_ms': run["iqr"] * 1000,
+        'time_ci_rel': run["ci_rel"],
+        'setup_ms': timing["setup"]["median"] * 1000,
+        'steps_per_s': timing["steps_per_s"],
+        'repetitions': run["n"],
+        'warmup': timing["warmup"],
+        'status': result.status,
+        'final_state': result.final_state,
+        'engine': engine,
+        'tape': tape,
+        'max_steps': max_steps
+    }
+
+def print_header():
+    print("*" * 78)
+    print(f"{'n':<5} {'Input':<15} {'Steps':<10} {'Median(ms)':<12} {'IQR(ms)':<10} {'Reps':<6} {'Status':<10}")
+    print("*" * 78)
+
+def print_row(r: Dict):
+    input_str = r['input']
+    input_display = input_str if len(input_str) <= 12 else input_str[:12] + "..."
+    print(f"{r['n']:<5} {input_display:<15} {r['steps']:<10} {r['time_ms']:<12.4f} "
+          f"{r['time_iqr_ms']:<10.4f} {r['repetitions']:<6} {r['status']:<10}")
+
+def benchmark_machine(machine_path: str, inputs: List[tuple], max_steps: int = 100000,
+                      engine: str = "basic", max_time: float = 600.0, tape: str = "dict",
+                      warmup: int = 2, min_reps: int = 5, max_reps: int = 50,
+                      target_rel_ci: float = 0.02, max_total_s: float = 30.0, cpu: int = None) -> List[Dict]:
     """
     Ejecuta benchmarks de una máquina con múltiples entradas
     
@@ -35,6 +95,11 @@ def benchmark_machine(machine_path: str, inputs: List[tuple], max_steps: int = 1
         machine_path: Ruta al archivo JSON de la máquina
         inputs: Lista de tuplas (n, entrada)
         max_steps: Máximo número de pasos permitidos
+        engine: Motor de simulación registrado en src/engines.py (o "auto")
+        max_time: Límite de tiempo por ejecución en segundos
+        tape: Implementación de la cinta (o "auto")
+        warmup, min_reps, max_reps, target_rel_ci, max_total_s, cpu:
+            parámetros del harness de medición (ver experiments/timing.py)
         
     Returns:
         Lista de diccionarios con resultados del benchmark
@@ -45,49 +110,18 @@ def benchmark_machine(machine_path: str, inputs: List[tuple], max_steps: int = 1
     machine_def = load_machine(machine_path)
     print(f"Máquina: {machine_def.name}\n")
     
-    print("*" * 60)
-    print(f"{'n':<5} {'Input':<15} {'Steps':<10} {'Time(ms)':<12} {'Status':<10}")
-    print("*" * 60)
-    
-    # Número de repeticiones para obtener tiempos promedio estables
-    REPS = 1
+    print_header()
 
     for n, input_str in inputs:
-        # Primera ejecución para obtener steps y status
-        tape = Tape(input_str, blank=machine_def.blank)
-        tm = TuringMachine(machine_def, tape)
-        # Limitar a 600 segundos por ejecución para evitar que se cuelgue en n=25 y n=30
-        result = tm.run(max_steps=max_steps, trace=False, window=20, max_time=600.0)
-
-        # Ejecutar REPS veces para medir tiempo promedio
-        start_time = time.perf_counter()
-        for _ in range(REPS):
-            t = Tape(input_str, blank=machine_def.blank)
-            m = TuringMachine(machine_def, t)
-            m.run(max_steps=max_steps, trace=False, window=20, max_time=600.0)
-        end_time = time.perf_counter()
-
-        avg_ms = ((end_time - start_time) / REPS) * 1000
-
-        # Guardar resultados
-        result_dict = {
-            'n': n,
-            'input_size': len(input_str),
-            'input': input_str,
-            'steps': result.steps,
-            'time_ms': avg_ms,
-            'time_s': (end_time - start_time) / REPS,
-            'repetitions': REPS,
-            'status': result.status,
-            'final_state': result.final_state
-        }
+        # Limitar el tiempo por ejecución para evitar que se cuelgue en n=25 y n=30
+        result_dict = benchmark_input(machine_def, n, input_str, max_steps=max_steps, engine=engine,
+                                      max_time=max_time, tape=tape, warmup=warmup, min_reps=min_reps,
+                                      max_reps=max_reps, target_rel_ci=target_rel_ci,
+                                      max_total_s=max_total_s, cpu=cpu)
         results.append(result_dict)
-
-        # Imprimir resultado
-        input_display = input_str if len(input_str) <= 12 else input_str[:12] + "..."
-        print(f"{n:<5} {input_display:<15} {result.steps:<10} {avg_ms:<12.4f} {result.status:<10}")
+        print_row(result_dict)
     
-    print("*" * 70)
+    print("*" * 78)
     
     return results
 
@@ -117,6 +151,8 @@ def print_summary(results: List[Dict]):
     failed = len([r for r in results if r['status'] == 'REJECT'])
     timeout_time = len([r for r in results if r['status'] == 'TIMEOUT_TIME'])
     timeout_steps = len([r for r in results if r['status'] == 'TIMEOUT_STEPS'])
+    timeout_predicted = len([r for r in results if r['status'] == 'TIMEOUT_PREDICTED'])
+    timeout_budget = len([r for r in results if r['status'] == 'TIMEOUT_BUDGET'])
     
     print("\n" + "*" * 70)
     print("RESUMEN")
@@ -126,6 +162,10 @@ def print_summary(results: List[Dict]):
     print(f"Rechazadas (REJECT):     {failed}")
     print(f"Timeout (Tiempo):        {timeout_time}")
     print(f"Timeout (Pasos):         {timeout_steps}")
+    if timeout_predicted:
+        print(f"Timeout (Predicción):    {timeout_predicted}")
+    if timeout_budget:
+        print(f"Timeout (Presupuesto):   {timeout_budget}")
     print(f"Tiempo total:            {total_time:.6f} s")
     print(f"Tiempo promedio:         {avg_time:.6f} s")
     print(f"Pasos totales:           {total_steps}")
@@ -160,34 +200,118 @@ def print_summary(results: List[Dict]):
             print(f"  Complejidad aparente: {complexity_hint}")
         print("-" * 70)
 
+def counter_machine() -> MachineDef:
+    """Contador binario infinito: genera bloques distintos sin parar."""
+    delta = {
+        ("r", "0"): ("0", "R", "r"), ("r", "1"): ("1", "R", "r"), ("r", "_"): ("_", "L", "c"),
+        ("c", "1"): ("0", "L", "c"), ("c", "0"): ("1", "R", "r"), ("c", "_"): ("1", "R", "r"),
+    }
+    return MachineDef(name="contador binario", blank="_", start_state="r",
+                      accept_states={"qa"}, reject_states={"qr"}, delta=delta)
+
+def saturated_cache_benchmark(max_steps: int = 1000000, cache_size: int = 4096, reps: int = 3) -> Dict:
+    """
+    Compara el mejor tiempo de "macro" con una caché chica (siempre llena,
+    descartando entradas) contra "basic". Solo informa: con tiempos de pared
+    el resultado depende de la carga del equipo.
+    """
+    import time
+    from src.tape import Tape
+    from src.machine import TuringMachine
+    from src.macro import MacroTuringMachine
+
+    m = counter_machine()
+    best = {}
+    for name in ("basic", "macro"):
+        times = []
+        for _ in range(reps):
+            tape = Tape("0", blank=m.blank)
+            if name == "basic":
+                tm = TuringMachine(m, tape)
+            else:
+                tm = MacroTuringMachine(m, tape, k=16, cache_size=cache_size)
+            t0 = time.perf_counter()
+            tm.run(max_steps=max_steps, trace=False)
+            times.append(time.perf_counter() - t0)
+        best[name] = min(times)
+    print(f"Caché saturada ({cache_size} entradas, {max_steps} pasos): "
+          f"basic {best['basic']:.3f} s, macro {best['macro']:.3f} s")
+    if best["macro"] > best["basic"]:
+        print("  ! macro con la caché saturada fue más lento que basic")
+    return best
+
 def main():
     """
     Función principal para ejecutar benchmarks
     """
+    p = argparse.ArgumentParser()
+    p.add_argument("--machine", default=os.path.join(os.path.dirname(__file__), '..', 'machines', 'fibonacci.json'))
+    p.add_argument("--generator", default="fibonacci", choices=["fibonacci", "unary", "random"],
+                   help="Generador de entradas")
+    p.add_argument("--symbol", default="1", help="Símbolo para el generador unary")
+    p.add_argument("--alphabet", default="01", help="Alfabeto para el generador random")
+    # NOTA: Empezar con valores pequeños. La máquina puede ser lenta para n grandes.
+    p.add_argument("--min-n", type=int, default=5)
+    p.add_argument("--max-n", type=int, default=20)
+    p.add_argument("--engine", default="basic", help="Motor de simulación (basic, macro, runner, auto)")
+    p.add_argument("--max-steps", type=int, default=200000000, help="Límite de pasos por ejecución")
+    p.add_argument("--max-time", type=float, default=600.0, help="Límite de tiempo por ejecución en segundos")
+    p.add_argument("--tape", default="dict", help="Implementación de la cinta (dict, mmap, auto)")
+    p.add_argument("--warmup", type=int, default=2, help="Corridas de calentamiento por entrada")
+    p.add_argument("--min-reps", type=int, default=5)
+    p.add_argument("--max-reps", type=int, default=50)
+    p.add_argument("--ci", type=float, default=0.02, help="Semiancho relativo del IC 95%% objetivo")
+    p.add_argument("--max-total", type=float, default=30.0, help="Segundos máximos de medición por entrada")
+    p.add_argument("--cpu", type=int, default=None, help="Fijar el proceso a esta CPU")
+    p.add_argument("--budget", type=float, default=None,
+                   help="Presupuesto global en segundos: límites por corrida predichos (ver budget.py)")
+    p.add_argument("--safety", type=float, default=3.0, help="Factor de seguridad sobre la predicción")
+    p.add_argument("--output", default="benchmark_results.json")
+    p.add_argument("--saturated-cache", action="store_true",
+                   help="Solo comparar macro con la caché saturada contra basic (ver saturated_cache_benchmark)")
+    args = p.parse_args()
+
+    if args.saturated_cache:
+        saturated_cache_benchmark()
+        return
+
     # Configuración
-    machine_path = os.path.join(os.path.dirname(__file__), '..', 'machines', 'fibonacci.json')
+    machine_path = args.machine
     
     if not os.path.exists(machine_path):
         print(f"Error: No se encontró la máquina en {machine_path}")
         return
     
     # Generar entradas (ajustar max_n para controlar número de pruebas)
-    # NOTA: Empezar con valores pequeños. La máquina puede ser lenta para n grandes.
-    min_n = 5
-    max_n = 20  
-    inputs = generate_inputs_fibonacci(min_n, max_n)
+    min_n = args.min_n
+    max_n = args.max_n
+    if args.generator == "unary":
+        inputs = generate_inputs_unary(min_n, max_n, args.symbol)
+    elif args.generator == "random":
+        inputs = generate_inputs_random(min_n, max_n, args.alphabet)
+    else:
+        inputs = generate_inputs_fibonacci(min_n, max_n)
     
     print(f"Generando {len(inputs)} casos de prueba (n={min_n} hasta n={max_n})")
     print()
     
     # Ejecutar benchmark
-    results = benchmark_machine(machine_path, inputs, max_steps=200000000)
+    harness = dict(warmup=args.warmup, min_reps=args.min_reps, max_reps=args.max_reps,
+                   target_rel_ci=args.ci, max_total_s=args.max_total, cpu=args.cpu)
+    if args.budget is not None:
+        from experiments.budget import adaptive_benchmark
+        results = adaptive_benchmark(machine_path, inputs, args.budget, max_steps=args.max_steps,
+                                     max_time=args.max_time,
+                                     safety=args.safety, engine=args.engine, tape=args.tape, **harness)
+    else:
+        results = benchmark_machine(machine_path, inputs, max_steps=args.max_steps,
+                                    max_time=args.max_time, engine=args.engine, tape=args.tape, **harness)
     
     # Mostrar resumen
     print_summary(results)
     
     # Guardar resultados
-    save_results(results, "benchmark_results.json")
+    save_results(results, args.output)
     
     print("\n¡Benchmark completado!")
     print("Ejecute experiments/plot.py para visualizar los resultados")
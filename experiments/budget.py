@@ -0,0 +1,212 @@
+"""
+Presupuestos adaptativos para barridos
+En lugar de usar el mismo max_steps y max_time para todas las entradas, se
+ajusta en línea el crecimiento de pasos y tiempo con los tamaños ya medidos
+(find_best_polynomial de plot.py) y se predice el costo del siguiente n.
+
+Con esa predicción:
+- cada corrida recibe límites propios (predicción x factor de seguridad)
+- las entradas se ejecutan de la más barata a la más cara
+- las que no caben en el presupuesto global se posponen y, si al final
+  siguen sin caber, se saltan (status SKIPPED_BUDGET) en vez de quemar
+  minutos sin aviso
+"""
+
+import sys
+import os
+import math
+import time
+import warnings
+from typing import List, Dict, Optional
+
+import numpy as np
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.loader import load_machine
+from experiments.bench import benchmark_input, print_header, print_row
+from experiments.plot import find_best_polynomial
+
+# con menos puntos no se extrapola
+MIN_POINTS = 3
+
+
+class GrowthPredictor:
+    """
+    Ajusta pasos(n) y tiempo(n) con los resultados completados.
+
+    Un polinomio subestima un crecimiento exponencial (fibonacci.json deja
+    F(n) unos en la cinta), así que la predicción nunca es menor que
+    extrapolar la razón de crecimiento entre los dos últimos n medidos.
+    """
+
+    def __init__(self):
+        self.n: List[float] = []
+        self.steps: List[float] = []
+        self.time_s: List[float] = []
+
+    def observe(self, n: int, steps: int, time_s: float) -> None:
+        self.n.append(float(n))
+        self.steps.append(float(steps))
+        self.time_s.append(float(time_s))
+
+    def _predict(self, values: List[float], n: int) -> Optional[float]:
+        if len(self.n) < MIN_POINTS:
+            return None
+        order = np.argsort(self.n)
+        x = np.array(self.n)[order]
+        y = np.array(values)[order]
+        # grado máximo menor que el número de puntos - 1 para no interpolar exacto
+        max_degree = max(1, min(3, len(x) - 2))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            _, coefficients, _ = find_best_polynomial(x, y, max_degree=max_degree, verbose=False)
+        poly = float(np.poly1d(coefficients)(n))
+
+        # extrapolación geométrica desde los dos últimos puntos
+        (n1, y1), (n2, y2) = (x[-2], y[-2]), (x[-1], y[-1])
+        geometric = y2
+        if y1 > 0 and y2 > y1 and n2 > n1 and n > n2:
+            geometric = y2 * (y2 / y1) ** ((n - n2) / (n2 - n1))
+        return max(poly, geometric, y2 if n >= n2 else 0.0)
+
+    def _predict_monotone(self, values: List[float], ns: List[int]) -> Dict[int, Optional[float]]:
+        # el ruido del ajuste puede predecir menos para un n mayor; con el
+        # máximo acumulado la predicción nunca baja al crecer n
+        preds: Dict[int, Optional[float]] = {}
+        running = None
+        for n in sorted(set(ns)):
+            p = self._predict(values, n)
+            if p is not None:
+                running = p if running is None else max(running, p)
+            preds[n] = running if p is not None else None
+        return preds
+
+    def predict_steps(self, n: int, ns: List[int] = ()) -> Optional[float]:
+        """ns: otros tamaños pendientes, para que la predicción sea monótona en n."""
+        return self._predict_monotone(self.steps, [m for m in ns if m < n] + [n])[n]
+
+    def predict_time(self, n: int, ns: List[int] = ()) -> Optional[float]:
+        return self._predict_monotone(self.time_s, [m for m in ns if m < n] + [n])[n]
+
+    def predict_all(self, ns: List[int]) -> Dict[int, tuple]:
+        """(pasos, tiempo) predichos para cada n, no decrecientes en n."""
+        steps = self._predict_monotone(self.steps, ns)
+        times = self._predict_monotone(self.time_s, ns)
+        return {n: (steps[n], times[n]) for n in ns}
+
+
+def adaptive_benchmark(machine_path: str, inputs: List[tuple], budget_s: float,
+                       max_steps: int = 200000000, max_time: float = 600.0, safety: float = 3.0,
+                       engine: str = "basic", tape: str = "dict", **harness) -> List[Dict]:
+    """
+    Barrido con presupuesto global `budget_s` (segundos de pared).
+
+    Args:
+        max_steps, max_time: límites máximos; los límites por corrida se
+            calculan como predicción x `safety` sin pasar de estos
+        harness: parámetros de experiments/timing.py (warmup, min_reps, ...)
+
+    Returns:
+        Resultados en el formato de benchmark_machine, ordenados por n
+    """
+    machine_def = load_machine(machine_path)
+    print(f"Máquina: {machine_def.name} | presupuesto global: {budget_s:.1f} s\n")
+    predictor = GrowthPredictor()
+    warmup = harness.get("warmup", 2)
+    min_reps = harness.get("min_reps", 5)
+    max_total_s = harness.get("max_total_s", 30.0)
+
+    def predicted_cost(pred_time: Optional[float]) -> Optional[float]:
+        if pred_time is None:
+            return None
+        # el harness corre warmup + min_reps veces, cortando en max_total_s
+        return min(max_total_s, pred_time * (warmup + min_reps)) + pred_time
+
+    pending = sorted(inputs, key=lambda item: (len(item[1]), item[0]))
+    deferred: List[tuple] = []
+    results: List[Dict] = []
+    start = time.perf_counter()
+
+    print_header()
+    while pending:
+        remaining = budget_s - (time.perf_counter() - start)
+        preds = predictor.predict_all([n for n, _ in pending + deferred])
+
+        # el más barato según la predicción (sin predicción: el más corto)
+        costs = [predicted_cost(preds[n][1]) for n, _ in pending]
+        if all(c is not None for c in costs):
+            i = min(range(len(pending)), key=lambda j: costs[j])
+        else:
+            i = 0
+        n, input_str = pending.pop(i)
+        cost = costs[i]
+
+        if remaining <= 0 or (cost is not None and cost > remaining):
+            deferred.append((n, input_str))
+            # si lo más barato no cabe, lo demás (más caro) tampoco
+            if remaining <= 0 or all(c is not None for c in costs):
+                deferred.extend(pending)
+                pending = []
+            continue
+
+        pred_steps, pred_time = preds[n]
+        run_steps = max_steps if pred_steps is None else min(max_steps, int(math.ceil(pred_steps * safety)) + 1)
+        time_cap = max_time if pred_time is None else min(max_time, max(1.0, pred_time * safety))
+        run_time = min(time_cap, max(remaining, 0.0))
+
+        r = benchmark_input(machine_def, n, input_str, max_steps=run_steps, engine=engine,
+                            max_time=run_time, tape=tape, **harness)
+        # se cortó por la predicción o por el presupuesto, no por los límites
+        # globales: si queda presupuesto se repite con max_steps/max_time; si
+        # no, se marca aparte
+        cut = ((r['status'] == 'TIMEOUT_STEPS' and run_steps < max_steps) or
+               (r['status'] == 'TIMEOUT_TIME' and run_time < max_time))
+        if cut:
+            # un corte de tiempo por el presupuesto no se repite: ya no queda
+            by_budget = r['status'] == 'TIMEOUT_TIME' and run_time < time_cap
+            remaining = budget_s - (time.perf_counter() - start)
+            if remaining > 0 and not by_budget:
+                limit = "pasos" if r['status'] == 'TIMEOUT_STEPS' else "tiempo"
+                print(f"  ! n={n} superó la predicción de {limit}, se repite con los límites globales")
+                run_steps, run_time = max_steps, min(max_time, remaining)
+                r = benchmark_input(machine_def, n, input_str, max_steps=run_steps, engine=engine,
+                                    max_time=run_time, tape=tape, **harness)
+                if r['status'] == 'TIMEOUT_TIME' and run_time < max_time:
+                    r['status'] = 'TIMEOUT_BUDGET'
+            else:
+                r['status'] = 'TIMEOUT_BUDGET' if by_budget else 'TIMEOUT_PREDICTED'
+        r['predicted_steps'] = pred_steps
+        r['predicted_time_s'] = pred_time
+        results.append(r)
+        print_row(r)
+
+        if r['status'] in ('ACCEPT', 'REJECT'):
+            predictor.observe(n, r['steps'], r['time_s'])
+            # con una observación nueva cambian las predicciones: lo pospuesto
+            # se vuelve a evaluar
+            pending.extend(deferred)
+            deferred = []
+
+    preds = predictor.predict_all([n for n, _ in deferred])
+    for n, input_str in deferred:
+        results.append({
+            'n': n,
+            'input_size': len(input_str),
+            'input': input_str,
+            'steps': 0,
+            'time_ms': 0.0,
+            'time_s': 0.0,
+            'repetitions': 0,
+            'status': 'SKIPPED_BUDGET',
+            'final_state': '',
+            'predicted_steps': preds[n][0],
+            'predicted_time_s': preds[n][1],
+            'engine': engine,
+            'tape': tape
+        })
+        print(f"{n:<5} {'(omitido)':<15} {'-':<10} {'-':<12} {'-':<10} {0:<6} SKIPPED_BUDGET")
+    print("*" * 78)
+
+    return sorted(results, key=lambda r: r['n'])
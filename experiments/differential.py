@@ -0,0 +1,148 @@
+"""
+Verificación diferencial entre motores
+Corre un corpus de máquinas y entradas en cada combinación (motor, cinta)
+registrada en src/engines.py y verifica que el RunResult, la cinta final y
+la posición del cabezal sean idénticos a los del motor de referencia
+("basic" con cinta "dict"). También compara la ejecución por lotes con
+prefijos compartidos (src/prefix.py) sobre el corpus completo.
+
+Uso:
+    python experiments/differential.py                  # máquinas de machines/
+    python experiments/differential.py --random 200     # + máquinas aleatorias
+"""
+
+import sys
+import os
+import glob
+import random
+import argparse
+import itertools
+import mmap
+from typing import List, Tuple
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.loader import load_machine, MachineDef
+from src.engines import ENGINES, create, close_tape
+from src.prefix import run_batch
+from src.machine import TuringMachine
+from src.mmap_tape import MmapTape
+
+REFERENCE = ("basic", "dict")
+STEP_LIMITS = [0, 1, 7, 100, 5000, 2000000]
+
+
+# cinta mmap con segmentos mínimos y un solo segmento residente, para que el
+# corpus cruce segmentos y los descarte constantemente
+SMALL_MMAP = "mmap-small"
+
+
+def backends() -> List[Tuple[str, str]]:
+    return [(e, t) for e, spec in ENGINES.items() for t in sorted(spec.tapes)] + [("basic", SMALL_MMAP)]
+
+
+def run_backend(m: MachineDef, input_str: str, engine: str, tape: str, max_steps: int):
+    if tape == SMALL_MMAP:
+        small = MmapTape(input_str, blank=m.blank, segment_cells=mmap.ALLOCATIONGRANULARITY, max_resident=1)
+        tm = TuringMachine(m, small)
+    else:
+        tm = create(m, input_str, engine=engine, tape=tape)
+    try:
+        result = tm.run(max_steps=max_steps, trace=False)
+        return result, tm.tape.to_dict(), tm.tape.head
+    finally:
+        close_tape(tm.tape)
+
+
+def corpus_inputs(m: MachineDef, alphabet: List[str], max_len: int = 3, unary_max: int = 12) -> List[str]:
+    """
+    Todas las cadenas sobre el alfabeto de entrada hasta max_len, más entradas
+    unarias largas (la convención de fibonacci.json).
+    """
+    inputs = [""]
+    for length in range(1, max_len + 1):
+        inputs.extend("".join(p) for p in itertools.product(alphabet, repeat=length))
+    for sym in alphabet:
+        inputs.extend(sym * n for n in range(max_len + 1, unary_max + 1))
+    return inputs
+
+
+def random_machine(rng: random.Random, n_states: int = 4, symbols: str = "01_") -> MachineDef:
+    states = [f"q{i}" for i in range(n_states)]
+    delta = {}
+    for q in states:
+        for s in symbols:
+            if rng.random() < 0.85:
+                delta[(q, s)] = (rng.choice(symbols), rng.choice("LRS"), rng.choice(states + ["qa", "qr"]))
+    return MachineDef(name="random", blank="_", start_state="q0",
+                      accept_states={"qa"}, reject_states={"qr"}, delta=delta)
+
+
+def check_machine(m: MachineDef, inputs: List[str], step_limits: List[int] = STEP_LIMITS) -> List[str]:
+    """
+    Retorna la lista de discrepancias encontradas (vacía si todo coincide).
+    """
+    mismatches = []
+    others = [b for b in backends() if b != REFERENCE]
+    for input_str in inputs:
+        for max_steps in step_limits:
+            expected = run_backend(m, input_str, *REFERENCE, max_steps)
+            for engine, tape in others:
+                got = run_backend(m, input_str, engine, tape, max_steps)
+                if got != expected:
+                    mismatches.append(
+                        f"{m.name} | input={input_str!r} max_steps={max_steps} | "
+                        f"{engine}/{tape}: {got[0]} head={got[2]} vs {expected[0]} head={expected[2]}"
+                    )
+    for max_steps in step_limits:
+        batch = run_batch(m, inputs, max_steps=max_steps)
+        for i, input_str in enumerate(inputs):
+            expected = run_backend(m, input_str, *REFERENCE, max_steps)
+            tape = batch.tape(i)
+            got = (batch.results[i], tape.to_dict(), tape.head)
+            if got != expected:
+                mismatches.append(
+                    f"{m.name} | input={input_str!r} max_steps={max_steps} | "
+                    f"prefix: {got[0]} head={got[2]} vs {expected[0]} head={expected[2]}"
+                )
+    return mismatches
+
+
+def main():
+    p = argparse.ArgumentParser(description="Verificación diferencial entre motores")
+    p.add_argument("--machines", nargs="*", default=None, help="Máquinas JSON (por defecto machines/*.json)")
+    p.add_argument("--max-len", type=int, default=3, help="Largo máximo de las entradas exhaustivas")
+    p.add_argument("--random", type=int, default=0, help="Número de máquinas aleatorias extra")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    paths = args.machines or sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'machines', '*.json')))
+    print(f"Backends: {', '.join(f'{e}/{t}' for e, t in backends())}, prefix")
+
+    mismatches = []
+    cases = 0
+    for path in paths:
+        m = load_machine(path)
+        alphabet = sorted({read for _, read in m.delta if read != m.blank}) or ["1"]
+        inputs = corpus_inputs(m, alphabet, max_len=args.max_len)
+        cases += len(inputs)
+        mismatches += check_machine(m, inputs)
+        print(f"  {m.name}: {len(inputs)} entradas")
+
+    rng = random.Random(args.seed)
+    for _ in range(args.random):
+        m = random_machine(rng)
+        inputs = ["".join(rng.choice("01_") for _ in range(rng.randint(0, 10))) for _ in range(5)]
+        cases += len(inputs)
+        mismatches += check_machine(m, inputs, step_limits=[0, 3, 50, 2000])
+
+    if mismatches:
+        for line in mismatches[:50]:
+            print(f"  DIFERENCIA: {line}")
+        raise AssertionError(f"{len(mismatches)} discrepancias entre motores")
+    print(f"OK: {cases} entradas idénticas en todos los motores")
+
+
+if __name__ == "__main__":
+    main()
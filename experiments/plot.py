@@ -47,12 +47,14 @@ def polynomial_regression(x: np.ndarray, y: np.ndarray, degree: int) -> Tuple[np
     
     return coefficients, r_squared
 
-def find_best_polynomial(x: np.ndarray, y: np.ndarray, max_degree: int = 5, force_degree: int = None) -> Tuple[int, np.ndarray, float]:
+def find_best_polynomial(x: np.ndarray, y: np.ndarray, max_degree: int = 5, force_degree: int = None,
+                         verbose: bool = True) -> Tuple[int, np.ndarray, float]:
     """
     Encuentra el mejor grado polinomial comparando R²
     
     Args:
         force_degree: Si se especifica, usa este grado independientemente del mejor R²
+        verbose: Si es False no imprime la comparación (para ajustes en línea)
     
     Returns:
         best_degree, best_coefficients, best_r_squared
@@ -61,25 +63,29 @@ def find_best_polynomial(x: np.ndarray, y: np.ndarray, max_degree: int = 5, forc
     best_r_squared = -1
     best_coefficients = None
     
-    print("\nProbando diferentes grados de polinomios:")
-    print("-" * 60)
+    if verbose:
+        print("\nProbando diferentes grados de polinomios:")
+        print("-" * 60)
     
     for degree in range(1, max_degree + 1):
         coefficients, r_squared = polynomial_regression(x, y, degree)
-        print(f"  Grado {degree}: R² = {r_squared:.6f}")
+        if verbose:
+            print(f"  Grado {degree}: R² = {r_squared:.6f}")
         
         if r_squared > best_r_squared:
             best_r_squared = r_squared
             best_degree = degree
             best_coefficients = coefficients
     
-    print("-" * 60)
-    print(f"  Mejor ajuste por R²: Grado {best_degree} con R² = {best_r_squared:.6f}")
+    if verbose:
+        print("-" * 60)
+        print(f"  Mejor ajuste por R²: Grado {best_degree} con R² = {best_r_squared:.6f}")
     
     # Si se fuerza un grado específico, usarlo
     if force_degree is not None:
         forced_coefficients, forced_r_squared = polynomial_regression(x, y, force_degree)
-        print(f"  *** USANDO GRADO FORZADO: {force_degree} con R² = {forced_r_squared:.6f} ***")
+        if verbose:
+            print(f"  *** USANDO GRADO FORZADO: {force_degree} con R² = {forced_r_squared:.6f} ***")
         return force_degree, forced_coefficients, forced_r_squared
     
     return best_degree, best_coefficients, best_r_squared
@@ -0,0 +1,293 @@
+"""
+Barrido distribuido de experimentos
+Cola de trabajos en SQLite: cada trabajo es (hash de máquina, entrada, motor,
+max_steps). Los trabajadores reclaman trabajos con un lease, los ejecutan con
+benchmark_machine y guardan el resultado. Si un trabajador muere, su lease
+vence y otro trabajador retoma el trabajo.
+
+Los trabajadores pueden ser varios procesos en el mismo equipo o varios
+equipos que comparten el archivo .db (SQLite sobre NFS depende de que el
+sistema de archivos respete los bloqueos).
+
+Uso:
+    python experiments/sweep.py enqueue --db sweep.db --machine machines/fibonacci.json --min-n 5 --max-n 30
+    python experiments/sweep.py worker --db sweep.db
+    python experiments/sweep.py status --db sweep.db
+    python experiments/sweep.py export --db sweep.db
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import socket
+import hashlib
+import sqlite3
+import argparse
+import tempfile
+import threading
+from typing import List, Dict, Optional
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from experiments.bench import benchmark_machine, generate_inputs_fibonacci, save_results
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS machines (
+    hash TEXT PRIMARY KEY,
+    name TEXT,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    machine_hash TEXT NOT NULL REFERENCES machines(hash),
+    n INTEGER,
+    input TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    max_steps INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    UNIQUE (machine_hash, input, engine, max_steps)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, n);
+"""
+
+
+class JobQueue:
+    """
+    Cola de trabajos respaldada por un archivo SQLite.
+    Estados de un trabajo: pending -> running -> done | failed
+    """
+
+    def __init__(self, db_path: str, lease_s: float = 300.0, max_attempts: int = 3):
+        self.db_path = db_path
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self.conn = self._connect()
+        self.conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: las transacciones se controlan con BEGIN IMMEDIATE
+        return sqlite3.connect(self.db_path, timeout=60.0, isolation_level=None)
+
+    def add_machine(self, machine_path: str) -> str:
+        with open(machine_path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        name = json.loads(source.decode("utf-8-sig")).get("name", machine_path)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO machines (hash, name, source) VALUES (?, ?, ?)",
+            (digest, name, source.decode("utf-8-sig")),
+        )
+        return digest
+
+    def enqueue(self, machine_path: str, inputs: List[tuple], engine: str = "basic",
+                max_steps: int = 200000000) -> int:
+        """
+        Agrega un trabajo por cada (n, entrada). Los trabajos repetidos se ignoran.
+        Retorna el número de trabajos nuevos.
+        """
+        digest = self.add_machine(machine_path)
+        before = self.conn.total_changes
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO jobs (machine_hash, n, input, engine, max_steps) VALUES (?, ?, ?, ?, ?)",
+            [(digest, n, input_str, engine, max_steps) for n, input_str in inputs],
+        )
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def claim(self, worker_id: str) -> Optional[sqlite3.Row]:
+        """
+        Reclama el siguiente trabajo pendiente (o con lease vencido), de menor n
+        primero. Retorna None si no queda nada por hacer.
+        """
+        now = time.time()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # los que agotaron sus intentos y cuyo lease venció ya no se reintentan
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease vencido') "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' "
+                "OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY n, id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (worker_id, now + self.lease_s, row["id"]),
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        finally:
+            self.conn.row_factory = None
+        return row
+
+    def renew(self, conn: sqlite3.Connection, job_id: int, worker_id: str) -> bool:
+        cur = conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (time.time() + self.lease_s, job_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: Dict) -> bool:
+        # solo se guarda si el lease sigue siendo nuestro
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, lease_expires = NULL "
+            "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (json.dumps(result), job_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_owner = NULL, lease_expires = NULL "
+            "WHERE id = ? AND lease_owner = ?",
+            (self.max_attempts, error, job_id, worker_id),
+        )
+
+    def machine_source(self, digest: str) -> str:
+        row = self.conn.execute("SELECT source FROM machines WHERE hash = ?", (digest,)).fetchone()
+        return row[0]
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def results(self) -> List[Dict]:
+        rows = self.conn.execute("SELECT result FROM jobs WHERE status = 'done' ORDER BY n, id").fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+
+def _machine_file(queue: JobQueue, digest: str, cache_dir: str) -> str:
+    # la máquina viaja dentro del .db, así cada equipo la materializa localmente
+    path = os.path.join(cache_dir, f"{digest}.json")
+    if not os.path.exists(path):
+        # el directorio es compartido entre trabajadores: se escribe a un
+        # temporal y se renombra, así nadie lee un archivo a medias
+        fd, tmp = tempfile.mkstemp(prefix=f".{digest}.", suffix=".tmp", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(queue.machine_source(digest))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return path
+
+
+def _heartbeat(queue: JobQueue, job_id: int, worker_id: str, stop: threading.Event) -> None:
+    conn = queue._connect()
+    try:
+        while not stop.wait(queue.lease_s / 3):
+            if not queue.renew(conn, job_id, worker_id):
+                print(f"[{worker_id}] Se perdió el lease del trabajo {job_id}")
+                return
+    finally:
+        conn.close()
+
+
+def run_worker(db_path: str, worker_id: str = None, lease_s: float = 300.0,
+               max_attempts: int = 3, max_time: float = None, idle_exit: bool = True) -> int:
+    """
+    Ciclo del trabajador: reclama, ejecuta y registra trabajos hasta vaciar la cola.
+    Retorna el número de trabajos completados.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    queue = JobQueue(db_path, lease_s=lease_s, max_attempts=max_attempts)
+    cache_dir = os.path.join(tempfile.gettempdir(), "tm_sweep_machines")
+    os.makedirs(cache_dir, exist_ok=True)
+    done = 0
+
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            if idle_exit:
+                break
+            time.sleep(5)
+            continue
+
+        print(f"[{worker_id}] Trabajo {job['id']}: n={job['n']} engine={job['engine']} (intento {job['attempts'] + 1})")
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(queue, job["id"], worker_id, stop), daemon=True)
+        beat.start()
+        try:
+            machine_path = _machine_file(queue, job["machine_hash"], cache_dir)
+            results = benchmark_machine(
+                machine_path, [(job["n"], job["input"])], max_steps=job["max_steps"],
+                engine=job["engine"], max_time=max_time,
+            )
+            stop.set()
+            beat.join()
+            if queue.complete(job["id"], worker_id, results[0]):
+                done += 1
+        except Exception as e:
+            stop.set()
+            beat.join()
+            queue.fail(job["id"], worker_id, f"{type(e).__name__}: {e}")
+            print(f"[{worker_id}] Falló el trabajo {job['id']}: {e}")
+
+    return done
+
+
+def main():
+    p = argparse.ArgumentParser(description="Barrido distribuido con cola en SQLite")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    enq = sub.add_parser("enqueue", help="Agregar trabajos de Fibonacci a la cola")
+    enq.add_argument("--db", required=True)
+    enq.add_argument("--machine", default=os.path.join(os.path.dirname(__file__), '..', 'machines', 'fibonacci.json'))
+    enq.add_argument("--min-n", type=int, default=5)
+    enq.add_argument("--max-n", type=int, default=20)
+    enq.add_argument("--engine", default="basic")
+    enq.add_argument("--max-steps", type=int, default=200000000)
+
+    wrk = sub.add_parser("worker", help="Ejecutar trabajos de la cola")
+    wrk.add_argument("--db", required=True)
+    wrk.add_argument("--lease", type=float, default=300.0, help="Duración del lease en segundos")
+    wrk.add_argument("--max-attempts", type=int, default=3)
+    wrk.add_argument("--max-time", type=float, default=None, help="Límite de tiempo por corrida (s)")
+    wrk.add_argument("--wait", action="store_true", help="Esperar trabajos nuevos en vez de salir")
+
+    st = sub.add_parser("status", help="Resumen de la cola")
+    st.add_argument("--db", required=True)
+
+    exp = sub.add_parser("export", help="Guardar resultados en formato de bench.py")
+    exp.add_argument("--db", required=True)
+    exp.add_argument("--output", default="benchmark_results.json")
+
+    args = p.parse_args()
+
+    if args.cmd == "enqueue":
+        queue = JobQueue(args.db)
+        added = queue.enqueue(args.machine, generate_inputs_fibonacci(args.min_n, args.max_n),
+                              engine=args.engine, max_steps=args.max_steps)
+        print(f"{added} trabajos agregados")
+    elif args.cmd == "worker":
+        done = run_worker(args.db, lease_s=args.lease, max_attempts=args.max_attempts,
+                          max_time=args.max_time, idle_exit=not args.wait)
+        print(f"{done} trabajos completados")
+    elif args.cmd == "status":
+        for status, count in sorted(JobQueue(args.db).counts().items()):
+            print(f"{status:<10} {count}")
+    elif args.cmd == "export":
+        save_results(JobQueue(args.db).results(), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Harness de medición de tiempos
+Mide una corrida (máquina + entrada) con:
+- corridas de calentamiento (warmup) que no se cuentan
+- repeticiones adaptativas hasta que el intervalo de confianza del 95% de la
+  media quede dentro de `target_rel_ci` (o se agote `max_reps`/`max_total_s`)
+- recolector de basura desactivado mientras se mide
+- opcionalmente fijado a una CPU (Linux, os.sched_setaffinity)
+- tiempo de preparación (cinta + motor) separado del tiempo de ejecución; los
+  motores con reset (basic, runner) se crean una vez y en cada repetición
+  solo se recarga la entrada
+
+Reporta mediana, rango intercuartil (IQR) y pasos por segundo.
+"""
+
+import sys
+import os
+import gc
+import math
+import time
+import statistics
+from typing import Dict, List
+
+# Agregar el directorio src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.loader import MachineDef
+from src.engines import create, close_tape
+
+# valores críticos de t de Student (dos colas, 95%) por grados de libertad
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+        9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042,
+        40: 2.021, 60: 2.000, 120: 1.980, 1000: 1.962}
+
+
+def t_critical(df: int) -> float:
+    # el grado de libertad tabulado inmediatamente menor (más conservador);
+    # desde 1000 la diferencia con la normal (1.96) es despreciable
+    return _T95[max(k for k in _T95 if k <= df)]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """
+    Estadísticos de una lista de tiempos en segundos.
+    """
+    n = len(samples)
+    mean = statistics.fmean(samples)
+    median = statistics.median(samples)
+    if n >= 2:
+        stdev = statistics.stdev(samples)
+        q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+        half = t_critical(n - 1) * stdev / math.sqrt(n)
+    else:
+        stdev, q1, q3, half = 0.0, samples[0], samples[0], float("inf")
+    return {
+        "n": n,
+        "mean": mean,
+        "median": median,
+        "stdev": stdev,
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "ci_low": mean - half,
+        "ci_high": mean + half,
+        "ci_rel": half / mean if mean > 0 else float("inf"),
+    }
+
+
+def time_run(machine_def: MachineDef, input_str: str, engine: str = "basic", tape: str = "dict",
+             max_steps: int = 100000, max_time: float = 600.0, warmup: int = 2, min_reps: int = 5,
+             max_reps: int = 50, target_rel_ci: float = 0.02, max_total_s: float = 30.0,
+             cpu: int = None) -> Dict:
+    """
+    Mide setup y ejecución de una corrida. Retorna un diccionario con el
+    RunResult, las muestras y sus estadísticos.
+
+    Si una sola corrida ya consume el presupuesto `max_total_s` (entradas
+    grandes), no se hacen más repeticiones: se reporta esa única medición.
+    """
+    old_affinity = None
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        old_affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {cpu})
+
+    gc_was_enabled = gc.isenabled()
+    setup_s: List[float] = []
+    run_s: List[float] = []
+    result = None
+    reusable = False
+    try:
+        gc.collect()
+        gc.disable()
+        begin = time.perf_counter()
+        reps = 0
+        tm = None
+        while True:
+            t0 = time.perf_counter()
+            if reusable:
+                tm.reset(input_str)
+            else:
+                tm = create(machine_def, input_str, engine=engine, tape=tape)
+            t1 = time.perf_counter()
+            result = tm.run(max_steps=max_steps, trace=False, window=20, max_time=max_time)
+            t2 = time.perf_counter()
+            # los motores con reset (y cinta con reset) se reutilizan entre repeticiones
+            reusable = hasattr(tm, "reset") and hasattr(tm.tape, "reset")
+            if not reusable:
+                close_tape(tm.tape)
+            reps += 1
+
+            if reps > warmup:
+                setup_s.append(t1 - t0)
+                run_s.append(t2 - t1)
+            if time.perf_counter() - begin >= max_total_s:
+                if not run_s:
+                    # corrida demasiado larga para calentar: se usa la última como muestra
+                    setup_s.append(t1 - t0)
+                    run_s.append(t2 - t1)
+                break
+            if len(run_s) >= max_reps:
+                break
+            if len(run_s) >= min_reps and summarize(run_s)["ci_rel"] <= target_rel_ci:
+                break
+    finally:
+        if reusable:
+            close_tape(tm.tape)
+        if gc_was_enabled:
+            gc.enable()
+        if old_affinity is not None:
+            os.sched_setaffinity(0, old_affinity)
+
+    run_stats = summarize(run_s)
+    setup_stats = summarize(setup_s)
+    return {
+        "result": result,
+        "run": run_stats,
+        "setup": setup_stats,
+        "samples_s": run_s,
+        "warmup": reps - len(run_s),
+        "steps_per_s": result.steps / run_stats["median"] if run_stats["median"] > 0 else 0.0,
+    }
@@ -1,7 +1,8 @@
 import argparse
 from .loader import load_machine
-from .tape import Tape
-from .machine import TuringMachine
+from .history import ExecutionHistory
+from .progress import ProgressReporter
+from .engines import ENGINES, TAPES, create, close_tape
 
 def main():
     p = argparse.ArgumentParser()
@@ -10,15 +11,37 @@ def main():
     p.add_argument("--trace", action="store_true", help="Imprimir configuraciones")
     p.add_argument("--max-steps", type=int, default=10000)
     p.add_argument("--window", type=int, default=20)
+    p.add_argument("--history", default=None, help="Carpeta donde guardar el historial columnar (.npy)")
+    p.add_argument("--engine", default="auto", choices=["auto", *ENGINES], help="Motor de simulación")
+    p.add_argument("--tape", default="auto", choices=["auto", *TAPES], help="Implementación de la cinta")
+    p.add_argument("--progress", action="store_true", help="Mostrar línea de estado con el progreso")
+    p.add_argument("--progress-interval", type=float, default=1.0, help="Segundos entre reportes de progreso")
+    p.add_argument("--metrics-file", default=None, help="Archivo de métricas (formato Prometheus)")
     args = p.parse_args()
 
     m = load_machine(args.machine)
-    tape = Tape(args.input, blank=m.blank)
-    tm = TuringMachine(m, tape)
+    try:
+        tm = create(m, args.input, engine=args.engine, tape=args.tape,
+                    trace=args.trace, history=bool(args.history))
+    except ValueError as e:
+        p.error(str(e))
 
     print(f"Machine: {m.name}")
-    result = tm.run(max_steps=args.max_steps, trace=args.trace, window=args.window)
+    history = ExecutionHistory() if args.history else None
+    extra = {}
+    if history is not None:
+        extra["history"] = history
+    if args.progress or args.metrics_file:
+        extra["progress"] = ProgressReporter(interval=args.progress_interval, status_line=args.progress,
+                                             metrics_file=args.metrics_file, name=m.name)
+    try:
+        result = tm.run(max_steps=args.max_steps, trace=args.trace, window=args.window, **extra)
+    finally:
+        close_tape(tm.tape)
     print(f"RESULT: {result.status} | steps={result.steps} | final_state={result.final_state}")
+    if history is not None:
+        history.save(args.history)
+        print(f"HISTORY: {len(history)} pasos ({history.nbytes()} bytes) guardados en {args.history}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,89 @@
+"""
+Cliente del servidor de simulación (ver server.py).
+Acepta los mismos flags que cli.py, pero la corrida la hace el servidor.
+
+    python -m src.client --machine machines/fibonacci.json --input 11111
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+
+def run_remote(machine: str, input_str: str, max_steps: int = 10000, max_time: float = None,
+               host: str = "127.0.0.1", port: int = 8765) -> dict:
+    req = {
+        "machine": os.path.abspath(machine),
+        "input": input_str,
+        "max_steps": max_steps,
+        "max_time": max_time,
+    }
+    data = json.dumps(req).encode("utf-8")
+    http_req = urllib.request.Request(
+        f"http://{host}:{port}/run", data=data, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(http_req) as resp:
+            return json.load(resp)
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(_http_error(e)) from None
+    except OSError as e:
+        # URLError (servidor apagado, host inválido) o conexión cortada
+        reason = e.reason if isinstance(e, urllib.error.URLError) else e
+        raise RuntimeError(f"No se pudo conectar con el servidor en {host}:{port}: {reason}") from None
+
+
+def _http_error(e: urllib.error.HTTPError) -> str:
+    # el servidor responde {"error": ...}; un proxy u otro servidor puede no hacerlo
+    try:
+        return json.loads(e.read())["error"]
+    except (ValueError, KeyError, TypeError):
+        return f"HTTP {e.code}: {e.reason}"
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--machine", required=True, help="Ruta al archivo JSON de la máquina")
+    p.add_argument("--input", required=True, help="Cadena de entrada (según convención)")
+    p.add_argument("--max-steps", type=int, default=10000)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    # flags de cli.py que el servidor no soporta: se rechazan en lugar de ignorarlos
+    p.add_argument("--trace", action="store_true", help="No soportado en modo servidor")
+    p.add_argument("--window", type=int, default=None, help="No soportado en modo servidor")
+    p.add_argument("--history", default=None, help="No soportado en modo servidor")
+    p.add_argument("--engine", default=None, help="No soportado en modo servidor (usa runner)")
+    p.add_argument("--tape", default=None, help="No soportado en modo servidor (usa dict)")
+    p.add_argument("--progress", action="store_true", help="No soportado en modo servidor")
+    p.add_argument("--progress-interval", type=float, default=None, help="No soportado en modo servidor")
+    p.add_argument("--metrics-file", default=None, help="No soportado en modo servidor")
+    args = p.parse_args()
+
+    unsupported = [flag for flag, given in (
+        ("--trace", args.trace),
+        ("--window", args.window is not None),
+        ("--history", args.history is not None),
+        ("--engine", args.engine not in (None, "auto", "runner")),
+        ("--tape", args.tape not in (None, "auto", "dict")),
+        ("--progress", args.progress),
+        ("--progress-interval", args.progress_interval is not None),
+        ("--metrics-file", args.metrics_file is not None),
+    ) if given]
+    if unsupported:
+        verb = "no está disponible" if len(unsupported) == 1 else "no están disponibles"
+        print(f"{', '.join(unsupported)} {verb} en modo servidor, use python -m src.cli", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        result = run_remote(args.machine, args.input, args.max_steps, host=args.host, port=args.port)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"RESULT: {result['status']} | steps={result['steps']} | final_state={result['final_state']}")
+
+
+if __name__ == "__main__":
+    main()
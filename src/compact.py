@@ -0,0 +1,412 @@
+"""
+REPRESENTACIÓN COMPACTA DE delta
+Para máquinas generadas con millones de transiciones, un dict de tuplas de
+strings cuesta cientos de bytes por transición. Aquí:
+
+- los nombres de estados, símbolos y movimientos se internan una sola vez
+  y la tabla guarda solo sus ids en arreglos tipados (`array`)
+- CompactDelta es un Mapping (state, read) -> (write, move, next), así que
+  TuringMachine y el resto del código la usan igual que el dict de siempre
+- el JSON se lee de forma incremental, sin cargar el documento completo en
+  memoria: las transiciones completas que hay en el buffer se decodifican
+  juntas con json.loads (una a la vez solo si el corte no es válido)
+- también se acepta un formato CSV (ver load_csv / save_csv)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Iterator
+
+
+class CompactDelta(Mapping):
+    def __init__(self):
+        self.states: list[str] = []
+        self.symbols: list[str] = []
+        self.moves: list[str] = []
+        self._state_ids: dict[str, int] = {}
+        self._symbol_ids: dict[str, int] = {}
+        self._move_ids: dict[str, int] = {}
+        # una fila por transición
+        self._state = array("I")
+        self._read = array("I")
+        self._write = array("I")
+        self._move = array("B")
+        self._next = array("I")
+        # índice: tabla densa (state_id * n_symbols + read_id -> fila)
+        # o claves ordenadas para búsqueda binaria si la tabla es muy dispersa
+        self._table: array | None = None
+        self._keys: array | None = None
+        self._n_symbols = 0
+
+    # ---------------------------------------------------------------
+    # Construcción
+    # ---------------------------------------------------------------
+
+    @staticmethod
+    def _intern(name: str, names: list[str], ids: dict[str, int]) -> int:
+        i = ids.get(name)
+        if i is None:
+            i = len(names)
+            name = sys.intern(name)
+            names.append(name)
+            ids[name] = i
+        return i
+
+    def add(self, state: str, read: str, write: str, move: str, nxt: str) -> None:
+        if self._table is not None or self._keys is not None:
+            raise RuntimeError("CompactDelta ya fue finalizada")
+        # camino rápido: casi siempre el nombre ya está internado
+        states, symbols = self._state_ids, self._symbol_ids
+        i = states.get(state)
+        self._state.append(i if i is not None else self._intern(state, self.states, states))
+        i = symbols.get(read)
+        self._read.append(i if i is not None else self._intern(read, self.symbols, symbols))
+        i = symbols.get(write)
+        self._write.append(i if i is not None else self._intern(write, self.symbols, symbols))
+        i = self._move_ids.get(move)
+        self._move.append(i if i is not None else self._intern(move, self.moves, self._move_ids))
+        i = states.get(nxt)
+        self._next.append(i if i is not None else self._intern(nxt, self.states, states))
+
+    def extend(self, transitions) -> None:
+        """add() para muchas transiciones {"state", "read", "write", "move", "next"}."""
+        if self._table is not None or self._keys is not None:
+            raise RuntimeError("CompactDelta ya fue finalizada")
+        states, symbols, moves = self._state_ids, self._symbol_ids, self._move_ids
+        sget, yget, mget = states.get, symbols.get, moves.get
+        intern = self._intern
+        state_col, read_col, write_col = self._state.append, self._read.append, self._write.append
+        move_col, next_col = self._move.append, self._next.append
+        for t in transitions:
+            name = t["state"]
+            i = sget(name)
+            state_col(i if i is not None else intern(name, self.states, states))
+            name = t["read"]
+            i = yget(name)
+            read_col(i if i is not None else intern(name, self.symbols, symbols))
+            name = t["write"]
+            i = yget(name)
+            write_col(i if i is not None else intern(name, self.symbols, symbols))
+            name = t["move"]
+            i = mget(name)
+            move_col(i if i is not None else intern(name, self.moves, moves))
+            name = t["next"]
+            i = sget(name)
+            next_col(i if i is not None else intern(name, self.states, states))
+
+    def finalize(self) -> "CompactDelta":
+        """Construye el índice; detecta transiciones duplicadas."""
+        n = len(self._state)
+        ns = self._n_symbols = max(1, len(self.symbols))
+        size = len(self.states) * ns
+        if size <= 4 * n + 1024:
+            table = array("i", [-1]) * size
+            for row, (sid, rid) in enumerate(zip(self._state, self._read)):
+                k = sid * ns + rid
+                if table[k] != -1:
+                    raise ValueError(f"Transicion Duplicada {self._key_of(row)}")
+                table[k] = row
+            self._table = table
+        else:
+            keys = [self._state[row] * ns + self._read[row] for row in range(n)]
+            order = sorted(range(n), key=keys.__getitem__)
+            for name in ("_state", "_read", "_write", "_move", "_next"):
+                col = getattr(self, name)
+                setattr(self, name, array(col.typecode, (col[row] for row in order)))
+            self._keys = array("q", (keys[row] for row in order))
+            for row in range(1, n):
+                if self._keys[row] == self._keys[row - 1]:
+                    raise ValueError(f"Transicion Duplicada {self._key_of(row)}")
+        return self
+
+    # ---------------------------------------------------------------
+    # Interfaz de Mapping
+    # ---------------------------------------------------------------
+
+    def _key_of(self, row: int) -> tuple[str, str]:
+        return self.states[self._state[row]], self.symbols[self._read[row]]
+
+    def _row(self, key) -> int:
+        state, read = key
+        sid = self._state_ids.get(state)
+        rid = self._symbol_ids.get(read)
+        if sid is None or rid is None:
+            return -1
+        k = sid * self._n_symbols + rid
+        if self._table is not None:
+            return self._table[k]
+        i = bisect_left(self._keys, k)
+        if i < len(self._keys) and self._keys[i] == k:
+            return i
+        return -1
+
+    def __getitem__(self, key) -> tuple[str, str, str]:
+        row = self._row(key)
+        if row < 0:
+            raise KeyError(key)
+        return (self.symbols[self._write[row]], self.moves[self._move[row]], self.states[self._next[row]])
+
+    def get(self, key, default=None):
+        row = self._row(key)
+        if row < 0:
+            return default
+        return (self.symbols[self._write[row]], self.moves[self._move[row]], self.states[self._next[row]])
+
+    def __contains__(self, key) -> bool:
+        return self._row(key) >= 0
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        for row in range(len(self._state)):
+            yield self._key_of(row)
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def nbytes(self) -> int:
+        cols = [self._state, self._read, self._write, self._move, self._next]
+        cols += [c for c in (self._table, self._keys) if c is not None]
+        return sum(c.itemsize * len(c) for c in cols)
+
+
+# ---------------------------------------------------------------
+# Lectura incremental de JSON
+# ---------------------------------------------------------------
+
+_WS = re.compile(r"[ \t\r\n]*")
+
+
+class _JSONStream:
+    """
+    Lector mínimo de un objeto JSON de primer nivel. Usa
+    json.JSONDecoder.raw_decode para cada valor y solo mantiene en memoria
+    el fragmento del archivo que se está decodificando.
+    """
+
+    def __init__(self, f, chunk: int = 1 << 18):
+        self.f = f
+        self.chunk = chunk
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        # elementos a leer con value() después de un batch() fallido
+        self.cooldown = 0
+
+    def _fill(self) -> None:
+        # lee al menos lo que ya hay en el buffer para que reintentar sea O(n)
+        data = self.f.read(max(self.chunk, len(self.buf) - self.pos))
+        if not data:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos] if self.pos < len(self.buf) else ""
+            self._fill()
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"JSON inválido: se esperaba {ch!r} y se encontró {got!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # un número o literal al final del buffer puede estar cortado
+            if end == len(self.buf) and not self.eof:
+                self._fill()
+                continue
+            self.pos = end
+            return obj
+
+
+    def batch(self) -> list:
+        """
+        Decodifica con un solo json.loads todos los elementos completos que
+        quedan en el buffer: desde la posición actual hasta el último "}"
+        (o el anterior, si el último cierra el documento). Si el corte no es
+        una secuencia válida de elementos (un "}" dentro de un string,
+        objetos anidados, otro tipo de valor) retorna [] y se usa value()
+        para los siguientes elementos.
+        """
+        if self.cooldown:
+            self.cooldown -= 1
+            return []
+        self.peek()
+        if len(self.buf) - self.pos < self.chunk and not self.eof:
+            self._fill()
+        end = len(self.buf)
+        for _ in range(2):
+            end = self.buf.rfind("}", self.pos, end)
+            if end < 0:
+                break
+            try:
+                items = json.loads("[" + self.buf[self.pos:end + 1] + "]")
+            except json.JSONDecodeError:
+                continue
+            self.pos = end + 1
+            return items
+        self.cooldown = 64
+        return []
+
+
+def iter_json_machine(f, header: dict) -> Iterator[dict]:
+    """
+    Recorre un archivo de máquina JSON y produce las transiciones una a una.
+    Los demás campos de primer nivel se guardan en `header`; en
+    header["transitions"] queda la cantidad de transiciones leídas (la clave
+    falta si el archivo no tiene "transitions").
+    """
+    s = _JSONStream(f)
+    s.expect("{")
+    if s.peek() == "}":
+        return
+    while True:
+        key = s.value()
+        s.expect(":")
+        if key == "transitions":
+            header[key] = count = 0
+            s.expect("[")
+            if s.peek() == "]":
+                s.pos += 1
+            else:
+                while True:
+                    # en bloque cuando se puede; si no, un elemento a la vez
+                    items = s.batch()
+                    if items:
+                        count += len(items)
+                        yield from items
+                    else:
+                        count += 1
+                        yield s.value()
+                    header[key] = count
+                    c = s.peek()
+                    s.pos += 1
+                    if c == "]":
+                        break
+                    if c != ",":
+                        raise ValueError(f"JSON inválido en transitions: {c!r}")
+        else:
+            header[key] = s.value()
+        c = s.peek()
+        s.pos += 1
+        if c == "}":
+            return
+        if c != ",":
+            raise ValueError(f"JSON inválido: {c!r}")
+
+
+def load_json(path: str) -> tuple[dict, CompactDelta]:
+    header: dict = {}
+    delta = CompactDelta()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        delta.extend(iter_json_machine(f, header))
+    # mismos errores que la carga con json.load
+    if "start_state" not in header:
+        raise KeyError("start_state")
+    if "transitions" not in header:
+        raise KeyError("transitions")
+    return header, delta.finalize()
+
+
+# ---------------------------------------------------------------
+# Formato CSV
+# ---------------------------------------------------------------
+#
+#   # name=Fibonacci en Unario
+#   # blank=_
+#   # start_state=q0
+#   # accept_states=qa
+#   # reject_states=qr
+#   state,read,write,move,next
+#   q0,1,Z,R,q1
+#
+# Los metadatos van antes del encabezado (obligatorio); desde el encabezado
+# todas las filas son transiciones, así un estado puede empezar con "#".
+# Las listas de estados de los metadatos van separadas por comas.
+
+CSV_COLUMNS = ["state", "read", "write", "move", "next"]
+_META_FIELDS = ("name", "blank", "start_state", "accept_states", "reject_states")
+_LIST_FIELDS = ("accept_states", "reject_states")
+
+
+def _parse_meta(line: str, header: dict) -> None:
+    # solo se quita el salto de línea y el espacio tras "#": "# blank= " es un blank " "
+    text = line[1:].rstrip("\r\n")
+    if text.startswith(" "):
+        text = text[1:]
+    key, sep, value = text.partition("=")
+    if not sep or key not in _META_FIELDS:
+        raise ValueError(f"Metadato CSV desconocido: {line.rstrip()!r}")
+    if key in _LIST_FIELDS:
+        header[key] = [v for v in value.split(",") if v]
+    else:
+        header[key] = value
+
+
+def load_csv(path: str) -> tuple[dict, CompactDelta]:
+    header: dict = {}
+    delta = CompactDelta()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for line in f:
+            if line.startswith("#"):
+                _parse_meta(line, header)
+            elif line.strip():
+                if next(csv.reader([line])) != CSV_COLUMNS:
+                    raise ValueError(f"Se esperaba el encabezado {','.join(CSV_COLUMNS)} antes de las transiciones")
+                break
+        else:
+            raise ValueError(f"Falta el encabezado {','.join(CSV_COLUMNS)}")
+        for row in csv.reader(f):
+            if not row:
+                continue
+            if len(row) != 5:
+                raise ValueError(f"Fila CSV inválida: {row}")
+            delta.add(*row)
+    # mismos errores que la carga con json.load
+    if "start_state" not in header:
+        raise KeyError("start_state")
+    if "transitions" not in header:
+        raise KeyError("transitions")
+    return header, delta.finalize()
+
+
+def save_csv(machine, path: str) -> None:
+    """Guarda una MachineDef (con delta compacta o dict) en formato CSV."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(f"# name={machine.name}\n")
+        f.write(f"# blank={machine.blank}\n")
+        f.write(f"# start_state={machine.start_state}\n")
+        f.write(f"# accept_states={','.join(sorted(machine.accept_states))}\n")
+        f.write(f"# reject_states={','.join(sorted(machine.reject_states))}\n")
+        w = csv.writer(f)
+        w.writerow(CSV_COLUMNS)
+        for (state, read), (write, move, nxt) in machine.delta.items():
+            w.writerow([state, read, write, move, nxt])
+
+
+if __name__ == "__main__":
+    # conversión: python -m src.compact maquina.json maquina.csv
+    from .loader import load_machine
+    if len(sys.argv) != 3:
+        print("Uso: python -m src.compact <entrada.json> <salida.csv>")
+        sys.exit(1)
+    save_csv(load_machine(sys.argv[1], compact_delta=True), sys.argv[2])
@@ -0,0 +1,170 @@
+"""
+REGISTRO DE MOTORES Y CINTAS
+Cada motor (engine) simula una MachineDef sobre una cinta y expone
+run(max_steps, trace, window, max_time) -> RunResult. Cada cinta expone
+head, blank, read, write, move, snapshot y to_dict.
+
+cli.py y bench.py eligen el backend por nombre con --engine/--tape; el
+nombre "auto" elige según la máquina y el tamaño de la entrada
+(ver select_backend).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from .loader import MachineDef
+from .tape import Tape
+from .mmap_tape import MmapTape
+from .machine import TuringMachine
+from .macro import MacroTuringMachine
+from .runner import Runner
+
+
+@dataclass
+class EngineSpec:
+    factory: Callable        # factory(machine, tape) -> motor
+    tapes: set[str]          # cintas compatibles
+    supports_trace: bool = False
+    supports_history: bool = False
+
+
+ENGINES: Dict[str, EngineSpec] = {}
+TAPES: Dict[str, Callable] = {}
+
+
+def register_engine(name: str, spec: EngineSpec) -> None:
+    ENGINES[name] = spec
+
+
+def register_tape(name: str, factory: Callable) -> None:
+    TAPES[name] = factory
+
+
+register_tape("dict", lambda input_str, blank: Tape(input_str, blank=blank))
+register_tape("mmap", lambda input_str, blank: MmapTape(input_str, blank=blank))
+
+register_engine("basic", EngineSpec(
+    factory=TuringMachine, tapes={"dict", "mmap"}, supports_trace=True, supports_history=True))
+register_engine("macro", EngineSpec(
+    factory=lambda m, tape: MacroTuringMachine(m, tape, k=16), tapes={"dict"}))
+register_engine("runner", EngineSpec(factory=Runner, tapes={"dict"}))
+
+
+# ---------------------------------------------------------------
+# Selección automática
+# ---------------------------------------------------------------
+
+# a partir de este tamaño de entrada conviene la cinta en disco
+MMAP_INPUT_CELLS = 10_000_000
+
+
+def machine_stats(m: MachineDef) -> dict:
+    """
+    Métricas de la tabla de transiciones usadas por select_backend.
+    sweep_ratio: fracción de transiciones que solo recorren la cinta
+    (mismo estado, mismo símbolo, se mueven L o R).
+    """
+    states = {m.start_state} | set(m.accept_states) | set(m.reject_states)
+    symbols = {m.blank}
+    sweeps = 0
+    for (state, read), (write, move, nxt) in m.delta.items():
+        states.add(state)
+        states.add(nxt)
+        symbols.add(read)
+        symbols.add(write)
+        if state == nxt and read == write and move in ("L", "R"):
+            sweeps += 1
+    n = len(m.delta)
+    return {
+        "states": len(states),
+        "alphabet": len(symbols),
+        "transitions": n,
+        "sweep_ratio": sweeps / n if n else 0.0,
+    }
+
+
+def _alphabet_size(m: MachineDef) -> int:
+    symbols = {m.blank}
+    for (_, read), (write, _, _) in m.delta.items():
+        symbols.add(read)
+        symbols.add(write)
+    return len(symbols)
+
+
+def _auto_tape(m: MachineDef, engine: str, input_size: int, alphabet: int = None) -> str:
+    # solo se recorre delta si la entrada es enorme
+    if input_size < MMAP_INPUT_CELLS or "mmap" not in ENGINES[engine].tapes:
+        return "dict"
+    if alphabet is None:
+        alphabet = _alphabet_size(m)
+    return "mmap" if alphabet <= 256 else "dict"
+
+
+def select_backend(m: MachineDef, input_size: int, trace: bool = False, history: bool = False,
+                   tape: str = None) -> tuple[str, str]:
+    """
+    Elige (motor, cinta) para una máquina y un tamaño de entrada, en este
+    orden de precedencia:
+    - trace o historial: solo "basic" los soporta.
+    - Máquinas con muchos barridos y alfabeto pequeño: "macro", que convierte
+      cada barrido de k celdas en una consulta a la caché. Con entradas muy
+      cortas no compensa el costo de llenar la caché.
+    - Entradas enormes: cinta "mmap" (1 byte por celda); "runner" solo usa la
+      cinta dict, así que en ese caso se usa "basic". "macro" tiene prioridad:
+      una máquina con muchos barridos sigue en "macro" con la cinta dict.
+    - En otro caso: "runner", el mismo algoritmo que "basic" con tabla anidada
+      y bucle sin asignaciones por paso.
+    - tape: cinta pedida explícitamente; el motor elegido debe soportarla
+      (si no, se usa "basic").
+    """
+    stats = machine_stats(m)
+    if trace or history:
+        engine = "basic"
+    elif stats["sweep_ratio"] >= 0.2 and stats["alphabet"] <= 16 and input_size >= 8:
+        engine = "macro"
+    else:
+        engine = "runner"
+
+    if tape is not None:
+        if tape not in ENGINES[engine].tapes:
+            engine = "basic"
+        return engine, tape
+    if engine == "runner" and input_size >= MMAP_INPUT_CELLS and stats["alphabet"] <= 256:
+        engine = "basic"
+    return engine, _auto_tape(m, engine, input_size, stats["alphabet"])
+
+
+def create(m: MachineDef, input_str: str, engine: str = "auto", tape: str = "auto",
+           trace: bool = False, history: bool = False):
+    """
+    Construye la cinta y el motor pedidos ("auto" para elegir automáticamente).
+    Retorna el motor; la cinta queda en motor.tape.
+    Las estadísticas de la máquina solo se calculan si algo es "auto".
+    """
+    if tape != "auto" and tape not in TAPES:
+        raise ValueError(f"Cinta desconocida: {tape} (disponibles: {', '.join(TAPES)})")
+    if engine == "auto":
+        engine, tape = select_backend(m, len(input_str), trace=trace, history=history,
+                                      tape=None if tape == "auto" else tape)
+    spec = ENGINES.get(engine)
+    if spec is None:
+        raise ValueError(f"Motor desconocido: {engine} (disponibles: {', '.join(ENGINES)})")
+    if tape == "auto":
+        tape = _auto_tape(m, engine, len(input_str))
+    if tape not in spec.tapes:
+        raise ValueError(f"El motor {engine} no soporta la cinta {tape}")
+    if trace and not spec.supports_trace:
+        raise ValueError(f"El motor {engine} no soporta trace")
+    if history and not spec.supports_history:
+        raise ValueError(f"El motor {engine} no soporta historial")
+
+    return spec.factory(m, TAPES[tape](input_str, m.blank))
+
+
+def close_tape(tape) -> None:
+    # las cintas en disco liberan sus archivos; Tape no necesita nada
+    close = getattr(tape, "close", None)
+    if close is not None:
+        close()
@@ -0,0 +1,166 @@
+"""
+HISTORIAL COLUMNAR DE EJECUCIÓN
+Guarda, por cada paso, el estado que disparó la transición, la posición del
+cabezal donde se escribió y el símbolo escrito.
+
+En lugar de imprimir texto (como --trace) se usan columnas tipadas del módulo
+`array`: 2 bytes para el estado, 4 para el cabezal y 2 para el símbolo, es
+decir 8 bytes por paso. Los nombres de estados y símbolos se internan una sola
+vez y en las columnas solo van sus ids. Si una máquina supera 65535 estados o
+símbolos, o el cabezal sale de ±2^31, la columna afectada se ensancha (4 y 8
+bytes) la primera vez que no cabe un valor.
+
+NumPy solo se importa al guardar o consultar, la simulación no lo necesita.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from array import array
+
+
+class ExecutionHistory:
+    def __init__(self):
+        self.state_names: list[str] = []
+        self.symbol_names: list[str] = []
+        self._state_ids: dict[str, int] = {}
+        self._symbol_ids: dict[str, int] = {}
+        self.states = array("H")   # id del estado que disparó la transición
+        self.heads = array("i")    # posición del cabezal al escribir
+        self.symbols = array("H")  # id del símbolo escrito
+        # columnas cargadas desde disco con `load`
+        self._loaded: dict | None = None
+
+    def __len__(self) -> int:
+        if self._loaded is not None:
+            return len(self._loaded["states"])
+        return len(self.states)
+
+    def _intern(self, name: str, names: list[str], ids: dict[str, int]) -> int:
+        i = ids.get(name)
+        if i is None:
+            i = len(names)
+            names.append(name)
+            ids[name] = i
+        return i
+
+    # registra un paso; lo llama TuringMachine.step
+    def record(self, state: str, head: int, written: str) -> None:
+        if self._loaded is not None:
+            raise ValueError("Historial cargado con load(): es de solo lectura")
+        sid = self._state_ids.get(state)
+        if sid is None:
+            sid = self._intern(state, self.state_names, self._state_ids)
+        wid = self._symbol_ids.get(written)
+        if wid is None:
+            wid = self._intern(written, self.symbol_names, self._symbol_ids)
+        try:
+            self.states.append(sid)
+            self.heads.append(head)
+            self.symbols.append(wid)
+        except OverflowError:
+            self._widen_and_record(sid, head, wid)
+
+    # tipo más ancho de cada columna
+    _WIDE = {"states": "I", "heads": "q", "symbols": "I"}
+
+    def _widen_and_record(self, sid: int, head: int, wid: int) -> None:
+        # alguna columna pudo recibir el valor antes de que otra desbordara
+        n = min(len(self.states), len(self.heads), len(self.symbols))
+        for name, value in (("states", sid), ("heads", head), ("symbols", wid)):
+            col = getattr(self, name)
+            del col[n:]
+            try:
+                array(col.typecode, [value])
+            except OverflowError:
+                if col.typecode == self._WIDE[name]:
+                    raise
+                col = array(self._WIDE[name], col)
+                setattr(self, name, col)
+            col.append(value)
+
+    def nbytes(self) -> int:
+        return sum(col.itemsize * len(col) for col in (self.states, self.heads, self.symbols))
+
+    # ---------------------------------------------------------------
+    # Acceso con NumPy
+    # ---------------------------------------------------------------
+
+    def _views(self) -> dict:
+        # vistas sin copia de las columnas. Mientras una vista exista, el
+        # `array` no puede crecer (record lanzaría BufferError), así que solo
+        # se usan dentro de un método y no se devuelven
+        if self._loaded is not None:
+            return self._loaded
+        import numpy as np
+        # los códigos de `array` (H, I, i, q) son también dtypes de NumPy
+        return {
+            "states": np.frombuffer(self.states, dtype=self.states.typecode),
+            "heads": np.frombuffer(self.heads, dtype=self.heads.typecode),
+            "symbols": np.frombuffer(self.symbols, dtype=self.symbols.typecode),
+        }
+
+    def columns(self) -> dict:
+        """
+        Devuelve las columnas como arreglos de NumPy. Si el historial se está
+        grabando son copias (se puede seguir llamando a record); si se cargó
+        con `load`, son los arreglos cargados.
+        """
+        if self._loaded is not None:
+            return self._loaded
+        return {name: col.copy() for name, col in self._views().items()}
+
+    def head_over_time(self):
+        """Posición del cabezal en cada paso."""
+        return self.columns()["heads"]
+
+    def steps_per_state(self) -> dict[str, int]:
+        """Número de pasos ejecutados desde cada estado."""
+        import numpy as np
+        counts = np.bincount(self._views()["states"], minlength=len(self.state_names))
+        return {name: int(counts[i]) for i, name in enumerate(self.state_names)}
+
+    def head_extent(self) -> tuple[int, int]:
+        """Posiciones mínima y máxima visitadas por el cabezal."""
+        heads = self._views()["heads"]
+        if len(heads) == 0:
+            return 0, 0
+        return int(heads.min()), int(heads.max())
+
+    # ---------------------------------------------------------------
+    # Persistencia
+    # ---------------------------------------------------------------
+
+    def save(self, directory: str) -> None:
+        """
+        Guarda cada columna como .npy y los nombres en names.json
+        dentro de `directory`.
+        """
+        import numpy as np
+        os.makedirs(directory, exist_ok=True)
+        for name, col in self._views().items():
+            np.save(os.path.join(directory, f"{name}.npy"), col)
+        with open(os.path.join(directory, "names.json"), "w", encoding="utf-8") as f:
+            json.dump({"states": self.state_names, "symbols": self.symbol_names}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "ExecutionHistory":
+        """
+        Carga un historial guardado con `save`. Con mmap=True las columnas se
+        leen desde disco bajo demanda, útil para historiales de 10^8 pasos.
+        """
+        import numpy as np
+        mode = "r" if mmap else None
+        h = cls()
+        with open(os.path.join(directory, "names.json"), "r", encoding="utf-8") as f:
+            names = json.load(f)
+        for s in names["states"]:
+            h._intern(s, h.state_names, h._state_ids)
+        for s in names["symbols"]:
+            h._intern(s, h.symbol_names, h._symbol_ids)
+        h._loaded = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+            for name in ("states", "heads", "symbols")
+        }
+        return h
@@ -0,0 +1,222 @@
+"""
+RE-SIMULACIÓN INCREMENTAL
+Al desarrollar una máquina se cambia una transición y se vuelve a correr la
+misma entrada larga desde el paso 0. IncrementalSession evita repetir el
+prefijo que no depende del cambio:
+
+- durante la corrida guarda, para cada clave (state, read) de delta, el
+  primer paso en que se consultó (también las claves que no existían, que
+  provocaron el rechazo por falta de transición)
+- cada `checkpoint_every` pasos guarda un checkpoint (pasos, estado, cabezal,
+  copia de la cinta); si hay demasiados se descarta uno de cada dos y el
+  intervalo se duplica
+- al volver a correr con una MachineDef modificada compara las dos tablas y
+  reanuda desde el último checkpoint anterior al primer uso de una clave
+  cambiada. Hasta ese paso la corrida habría sido idéntica, así que el
+  RunResult y la cinta final son los de una corrida completa
+
+Si cambian la entrada, el blank, el estado inicial o los estados de
+aceptación/rechazo, se corre desde el inicio.
+
+Modo watch:
+    python -m src.incremental --machine machines/fibonacci.json --input 1111111111111111 --max-steps 10000000 --watch
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+from .loader import MachineDef, TransitionKey, TransitionVal, load_machine
+from .machine import RunResult
+from .tape import Tape
+
+
+@dataclass
+class Checkpoint:
+    steps: int
+    state: str
+    head: int
+    cells: Dict[int, str]
+
+
+def diff_delta(old: Mapping[TransitionKey, TransitionVal],
+               new: Mapping[TransitionKey, TransitionVal]) -> set[TransitionKey]:
+    """Claves agregadas, eliminadas o con distinto (write, move, next)."""
+    changed = {key for key, val in old.items() if new.get(key) != val}
+    changed.update(key for key in new if key not in old)
+    return changed
+
+
+class IncrementalSession:
+    def __init__(self, checkpoint_every: int = 1 << 16, max_checkpoints: int = 32):
+        self.initial_every = checkpoint_every
+        self.max_checkpoints = max_checkpoints
+        self.checkpoint_every = checkpoint_every
+        self.checkpoints: List[Checkpoint] = []
+        self.first_use: Dict[TransitionKey, int] = {}
+        self.tape: Optional[Tape] = None
+        # paso desde el que se reanudó la última corrida (0 = corrida completa)
+        self.resumed_from = 0
+        self._header = None
+        self._input: Optional[str] = None
+        self._delta: Optional[Dict[TransitionKey, TransitionVal]] = None
+
+    def reset(self) -> None:
+        self.checkpoint_every = self.initial_every
+        self.checkpoints = []
+        self.first_use = {}
+        self._header = None
+        self._input = None
+        self._delta = None
+
+    @staticmethod
+    def _header_of(m: MachineDef) -> tuple:
+        return (m.blank, m.start_state, frozenset(m.accept_states), frozenset(m.reject_states))
+
+    def _resume_point(self, m: MachineDef, input_str: str, max_steps: int) -> Checkpoint:
+        if self._delta is None or self._input != input_str or self._header != self._header_of(m):
+            self.reset()
+            self._header = self._header_of(m)
+            self._input = input_str
+            self._delta = dict(m.delta.items())
+            ckpt = Checkpoint(0, m.start_state, 0, Tape(input_str, blank=m.blank).cells)
+            self.checkpoints = [ckpt]
+            return ckpt
+
+        changed = diff_delta(self._delta, m.delta)
+        if changed:
+            self._delta = dict(m.delta.items())
+        first = min((self.first_use[k] for k in changed if k in self.first_use), default=max_steps)
+        limit = min(first, max_steps)
+
+        # último checkpoint con steps <= limit (el del paso 0 siempre está)
+        i = len(self.checkpoints) - 1
+        while self.checkpoints[i].steps > limit:
+            i -= 1
+        ckpt = self.checkpoints[i]
+        del self.checkpoints[i + 1:]
+        # los primeros usos desde el checkpoint se vuelven a registrar
+        self.first_use = {k: s for k, s in self.first_use.items() if s < ckpt.steps}
+        return ckpt
+
+    def _checkpoint(self, steps: int, state: str, head: int, cells: Dict[int, str]) -> None:
+        if self.checkpoints[-1].steps == steps:
+            self.checkpoints[-1] = Checkpoint(steps, state, head, dict(cells))
+            return
+        self.checkpoints.append(Checkpoint(steps, state, head, dict(cells)))
+        if len(self.checkpoints) > self.max_checkpoints:
+            # se conserva el del paso 0 y uno de cada dos
+            self.checkpoints = self.checkpoints[::2]
+            self.checkpoint_every *= 2
+
+    def run(self, machine: MachineDef, input_str: str, max_steps: int = 10000,
+            max_time: float = None) -> RunResult:
+        """
+        Misma semántica que TuringMachine.run(trace=False). La cinta final
+        queda en self.tape.
+        """
+        ckpt = self._resume_point(machine, input_str, max_steps)
+        self.resumed_from = ckpt.steps
+
+        accept, reject = machine.accept_states, machine.reject_states
+        delta = self._delta
+        first_use = self.first_use
+        blank = machine.blank
+        tape = Tape("", blank=blank)
+        cells = tape.cells = dict(ckpt.cells)
+        state, head, steps = ckpt.state, ckpt.head, ckpt.steps
+        next_checkpoint = steps + self.checkpoint_every
+        missing = False
+        status = None
+
+        start_time = time.time()
+        for i in range(max_steps - steps):
+            if max_time is not None and i % 100000 == 0 and time.time() - start_time > max_time:
+                status = "TIMEOUT_TIME"
+                break
+            if steps >= next_checkpoint:
+                self._checkpoint(steps, state, head, cells)
+                next_checkpoint = steps + self.checkpoint_every
+            if state in accept or state in reject:
+                break
+
+            key = (state, cells.get(head, blank))
+            if key not in first_use:
+                first_use[key] = steps
+            val = delta.get(key)
+            if val is None:
+                missing = True
+                break
+            write_sym, move_dir, state = val
+            if write_sym == blank:
+                cells.pop(head, None)
+            else:
+                cells[head] = write_sym
+            if move_dir == "R":
+                head += 1
+            elif move_dir == "L":
+                head -= 1
+            elif move_dir != "S":
+                raise ValueError(f"Movimiento invalido:{move_dir}")
+            steps += 1
+        else:
+            status = "TIMEOUT_STEPS"
+
+        # configuración final (antes del rechazo por falta de transición, para
+        # que agregar esa transición permita reanudar desde aquí)
+        self._checkpoint(steps, state, head, cells)
+        tape.head = head
+        self.tape = tape
+
+        if status is not None:
+            return RunResult(status, steps, state)
+        if missing:
+            state = next(iter(reject), "qr")
+        if state in accept:
+            return RunResult("ACCEPT", steps, state)
+        if state in reject:
+            return RunResult("REJECT", steps, state)
+        return RunResult("UNKNOWN", steps, state)
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--machine", required=True, help="Ruta al archivo JSON de la máquina")
+    p.add_argument("--input", required=True, help="Cadena de entrada (según convención)")
+    p.add_argument("--max-steps", type=int, default=10000)
+    p.add_argument("--max-time", type=float, default=None)
+    p.add_argument("--checkpoint-every", type=int, default=1 << 16, help="Pasos entre checkpoints")
+    p.add_argument("--watch", action="store_true", help="Volver a correr cada vez que cambie el archivo")
+    p.add_argument("--interval", type=float, default=0.5, help="Segundos entre revisiones del archivo")
+    args = p.parse_args()
+
+    session = IncrementalSession(checkpoint_every=args.checkpoint_every)
+    last_mtime = None
+    while True:
+        mtime = os.stat(args.machine).st_mtime_ns
+        if mtime != last_mtime:
+            last_mtime = mtime
+            try:
+                m = load_machine(args.machine)
+            except (ValueError, KeyError) as e:
+                print(f"ERROR: {e}")
+            else:
+                t0 = time.perf_counter()
+                result = session.run(m, args.input, max_steps=args.max_steps, max_time=args.max_time)
+                elapsed = time.perf_counter() - t0
+                print(f"RESULT: {result.status} | steps={result.steps} | final_state={result.final_state}"
+                      f" | reanudado desde el paso {session.resumed_from} | {elapsed:.3f} s")
+        if not args.watch:
+            break
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            break
+
+
+if __name__ == "__main__":
+    main()
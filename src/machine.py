@@ -2,6 +2,8 @@
 from dataclasses import dataclass
 from .tape import Tape
 from .loader import MachineDef
+from .history import ExecutionHistory
+from .progress import ProgressReporter
 
 @dataclass
 class RunResult:
@@ -15,6 +17,13 @@ class TuringMachine:
         self.tape = tape
         self.state = machine.start_state
         self.steps = 0
+        self.history: ExecutionHistory = None
+
+    # reinicia la máquina con otra entrada, reutilizando la cinta
+    def reset(self, input_data) -> None:
+        self.tape.reset(input_data)
+        self.state = self.m.start_state
+        self.steps = 0
 
     def step(self) -> bool:
         # retorna False si ya se detuvo
@@ -32,13 +41,29 @@ class TuringMachine:
             return False
 
         write_sym, move_dir, next_state = self.m.delta[key]
+        if self.history is not None:
+            self.history.record(self.state, self.tape.head, write_sym)
         self.tape.write(write_sym)
         self.tape.move(move_dir)
         self.state = next_state
         self.steps += 1
         return True
 
-    def run(self, max_steps: int = 10000, trace: bool = True, window: int = 20, max_time: float = None) -> RunResult:
+    def run(self, max_steps: int = 10000, trace: bool = True, window: int = 20, max_time: float = None,
+            history: ExecutionHistory = None, progress: ProgressReporter = None) -> RunResult:
+        # historial columnar opcional (ver history.py)
+        self.history = history
+        if progress is None:
+            return self._run(max_steps, trace, window, max_time)
+        progress.start(max_steps, self.steps)
+        result = self._run(max_steps, trace, window, max_time, progress)
+        progress.finish(self.steps, self.state, self.tape.head)
+        return result
+
+    def _run(self, max_steps: int, trace: bool, window: int, max_time: float,
+             progress: ProgressReporter = None) -> RunResult:
+        if progress is not None:
+            return self._run_with_progress(max_steps, trace, window, max_time, progress)
         import time
         start_time = time.time()
         for i in range(max_steps):
@@ -58,7 +83,48 @@ class TuringMachine:
         else:
             # Si el bucle termina sin hacer break, se alcanzó el límite de pasos
             return RunResult("TIMEOUT_STEPS", self.steps, self.state)
+        return self._final_result()
+
+    def _run_with_progress(self, max_steps: int, trace: bool, window: int, max_time: float,
+                           progress: ProgressReporter) -> RunResult:
+        # mismo bucle que _run, en tramos de check_every pasos: el progreso se
+        # consulta entre tramos (como Runner._run), no en cada paso
+        import time
+        start_time = time.time()
+        i = 0
+        next_poll = 0
+        stopped = False
+        while i < max_steps:
+            if i == next_poll:
+                next_poll += progress.poll(self.steps, self.state, self.tape.head)
+            end = min(max_steps, next_poll)
+            for i in range(i, end):
+                if max_time is not None and i % 100000 == 0 and time.time() - start_time > max_time:
+                    return RunResult("TIMEOUT_TIME", self.steps, self.state)
+                if trace:
+                    self._print_config(window)
+
+                if not self.step():
+                    stopped = True
+                    break
+            if stopped:
+                break
+            i = end
+        else:
+            return RunResult("TIMEOUT_STEPS", self.steps, self.state)
+        return self._final_result()
+
+    # misma impresión que el bucle de _run
+    def _print_config(self, window: int) -> None:
+        snap, left_index = self.tape.snapshot(window)
+        head_in_snap = self.tape.head - left_index
+        pointer = " " * head_in_snap + "^"
+        print(f"step={self.steps} state={self.state} head={self.tape.head}")
+        print(snap)
+        print(pointer)
+        print("-" * 60)
 
+    def _final_result(self) -> RunResult:
         if self.state in self.m.accept_states:
             return RunResult("ACCEPT", self.steps, self.state)
         if self.state in self.m.reject_states:
@@ -0,0 +1,238 @@
+"""
+MOTOR DE MACRO-SÍMBOLOS (aceleración lineal)
+Agrupa k celdas consecutivas de la cinta en un macro-símbolo (una tupla de k
+símbolos) y simula la MachineDef sobre macro-celdas.
+
+Una macro-transición es
+    (estado, posición de entrada, macro-símbolo)
+        -> (estado, posición de salida, nuevo macro-símbolo, pasos, tipo)
+y se obtiene simulando la máquina dentro del bloque hasta que el cabezal
+sale por la izquierda o la derecha, o hasta que se detiene. Se calcula la
+primera vez que se necesita y se guarda en una caché acotada; en máquinas
+que barren la cinta (como fibonacci.json) un recorrido de k celdas se vuelve
+una sola consulta a la caché.
+
+El número de pasos se conserva exacto: cada macro-transición suma sus pasos
+reales y, cuando el límite de pasos cae dentro de un bloque, el resto se
+simula celda por celda. El RunResult y la cinta final son los mismos que
+con TuringMachine.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+from .tape import Tape
+from .loader import MachineDef
+from .machine import RunResult
+from .progress import ProgressReporter
+
+# tipos de macro-transición
+EXIT = 0    # el cabezal salió del bloque
+HALT = 1    # se llegó a un estado de aceptación o rechazo dentro del bloque
+STUCK = 2   # no hay transición para (estado, símbolo)
+LOOP = 3    # la máquina cicla dentro del bloque sin salir nunca
+
+_MOVES = {"L": -1, "R": 1, "S": 0}
+
+
+class MacroTuringMachine:
+    def __init__(self, machine: MachineDef, tape: Tape, k: int = 16, cache_size: int = 1 << 18):
+        if k < 1:
+            raise ValueError("k debe ser al menos 1")
+        self.m = machine
+        self.tape = tape
+        self.k = k
+        self.cache_size = cache_size
+        self.state = machine.start_state
+        self.steps = 0
+        self.halting = set(machine.accept_states) | set(machine.reject_states)
+        # FIFO acotada: popitem(last=False) descarta la más antigua en O(1)
+        self.cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # cinta de macro-celdas: índice de bloque -> tupla de k símbolos
+        self.blank_block = (tape.blank,) * k
+        self.blocks: dict[int, tuple] = {}
+        grouped: dict[int, list] = {}
+        for pos, sym in tape.cells.items():
+            idx, off = divmod(pos, k)
+            grouped.setdefault(idx, list(self.blank_block))[off] = sym
+        for idx, cells in grouped.items():
+            self.blocks[idx] = tuple(cells)
+        self.head = tape.head
+
+    # ---------------------------------------------------------------
+    # Macro-transiciones
+    # ---------------------------------------------------------------
+
+    def _compute(self, state: str, off: int, block: tuple) -> tuple:
+        # simula dentro del bloque hasta salir, detenerse o ciclar
+        k = self.k
+        delta = self.m.delta
+        cells = list(block)
+        steps = 0
+        seen = None
+        while True:
+            if state in self.halting:
+                return state, off, tuple(cells), steps, HALT
+            t = delta.get((state, cells[off]))
+            if t is None:
+                return state, off, tuple(cells), steps, STUCK
+            write_sym, move_dir, state = t
+            cells[off] = write_sym
+            steps += 1
+            d = _MOVES.get(move_dir)
+            if d is None:
+                raise ValueError(f"Movimiento invalido:{move_dir}")
+            off += d
+            if off < 0 or off >= k:
+                return state, off, tuple(cells), steps, EXIT
+            # solo se buscan ciclos si el bloque retiene al cabezal demasiado
+            if steps > 16 * k:
+                conf = (state, off, tuple(cells))
+                if seen is None:
+                    seen = set()
+                elif conf in seen:
+                    return state, off, tuple(cells), steps, LOOP
+                seen.add(conf)
+
+    def _transition(self, state: str, off: int, block: tuple) -> tuple:
+        key = (state, off, block)
+        tr = self.cache.get(key)
+        if tr is not None:
+            self.hits += 1
+            return tr
+        self.misses += 1
+        tr = self._compute(state, off, block)
+        if len(self.cache) >= self.cache_size:
+            # se descarta la entrada más antigua
+            self.cache.popitem(last=False)
+        self.cache[key] = tr
+        return tr
+
+    # ---------------------------------------------------------------
+    # Simulación celda por celda (cuando el límite cae dentro de un bloque)
+    # ---------------------------------------------------------------
+
+    def _run_single(self, max_steps: int, deadline: float = None) -> str:
+        # retorna "TIMEOUT_TIME", "STUCK" si no hubo transición, o None
+        k = self.k
+        delta = self.m.delta
+        while self.steps < max_steps:
+            if deadline is not None and self.steps % 100000 == 0 and time.time() > deadline:
+                return "TIMEOUT_TIME"
+            if self.state in self.halting:
+                return None
+            idx, off = divmod(self.head, k)
+            block = self.blocks.get(idx, self.blank_block)
+            t = delta.get((self.state, block[off]))
+            if t is None:
+                self.state = next(iter(self.m.reject_states), "qr")
+                return "STUCK"
+            write_sym, move_dir, self.state = t
+            cells = list(block)
+            cells[off] = write_sym
+            self._store(idx, tuple(cells))
+            d = _MOVES.get(move_dir)
+            if d is None:
+                raise ValueError(f"Movimiento invalido:{move_dir}")
+            self.head += d
+            self.steps += 1
+        return None
+
+    def _store(self, idx: int, block: tuple) -> None:
+        if block == self.blank_block:
+            self.blocks.pop(idx, None)
+        else:
+            self.blocks[idx] = block
+
+    def _sync_tape(self) -> None:
+        # vuelca las macro-celdas a la Tape original
+        blank = self.tape.blank
+        cells = self.tape.cells
+        cells.clear()
+        for idx, block in self.blocks.items():
+            base = idx * self.k
+            for off, sym in enumerate(block):
+                if sym != blank:
+                    cells[base + off] = sym
+        self.tape.head = self.head
+
+    # ---------------------------------------------------------------
+    # Ejecución
+    # ---------------------------------------------------------------
+
+    def run(self, max_steps: int = 10000, trace: bool = False, window: int = 20, max_time: float = None,
+            progress: ProgressReporter = None) -> RunResult:
+        if trace:
+            raise ValueError("El motor de macro-símbolos no soporta trace, use TuringMachine")
+        if progress is not None:
+            progress.start(max_steps, self.steps)
+        try:
+            status = self._run(max_steps, max_time, progress)
+        finally:
+            self._sync_tape()
+        if progress is not None:
+            progress.finish(self.steps, self.state, self.head)
+        if status is not None:
+            return RunResult(status, self.steps, self.state)
+        if self.state in self.m.accept_states:
+            return RunResult("ACCEPT", self.steps, self.state)
+        if self.state in self.m.reject_states:
+            return RunResult("REJECT", self.steps, self.state)
+        return RunResult("UNKNOWN", self.steps, self.state)
+
+    def _run(self, max_steps: int, max_time: float = None, progress: ProgressReporter = None) -> str:
+        # retorna el estado de timeout, o None si la máquina se detuvo
+        k = self.k
+        blocks = self.blocks
+        blank_block = self.blank_block
+        cache = self.cache
+        deadline = None if max_time is None else time.time() + max_time
+        next_check = 0
+        next_progress = self.steps
+        max_steps += self.steps
+
+        while True:
+            if self.steps >= max_steps:
+                return "TIMEOUT_STEPS"
+            if deadline is not None and self.steps >= next_check:
+                if time.time() > deadline:
+                    return "TIMEOUT_TIME"
+                next_check = self.steps + 100000
+            if progress is not None and self.steps >= next_progress:
+                next_progress = self.steps + progress.poll(self.steps, self.state, self.head)
+            if self.state in self.halting:
+                return None
+
+            idx, off = divmod(self.head, k)
+            block = blocks.get(idx, blank_block)
+            key = (self.state, off, block)
+            tr = cache.get(key)
+            if tr is None:
+                tr = self._transition(self.state, off, block)
+            else:
+                self.hits += 1
+            new_state, new_off, new_block, n, kind = tr
+
+            if kind == LOOP or self.steps + n > max_steps:
+                # el límite de pasos cae dentro del bloque: se termina celda por celda
+                r = self._run_single(max_steps, deadline)
+                if r == "TIMEOUT_TIME":
+                    return r
+                if r == "STUCK":
+                    return None
+                continue
+
+            if new_block is not block:
+                self._store(idx, new_block)
+            self.state = new_state
+            self.steps += n
+            self.head = idx * k + new_off
+
+            if kind == STUCK and self.steps < max_steps:
+                self.state = next(iter(self.m.reject_states), "qr")
+                return None
@@ -0,0 +1,225 @@
+"""
+CINTA RESPALDADA EN DISCO (memory-mapped)
+Alternativa a Tape para corridas muy largas: cada celda ocupa 1 byte en un
+archivo mapeado en memoria, en lugar de una entrada del diccionario `cells`
+(decenas de bytes por celda).
+
+La cinta se divide en segmentos de `segment_cells` celdas; el segmento i
+cubre las posiciones [i*segment_cells, (i+1)*segment_cells) y puede ser
+negativo, así la cinta crece hacia ambos lados. Un segmento solo se crea al
+escribir en él un símbolo distinto de blank (leer fuera de la cinta escrita
+devuelve blank sin tocar el disco). Los archivos se crean dispersos, así que
+el disco solo se usa en las páginas realmente escritas.
+
+Solo `max_resident` segmentos se mantienen mapeados a la vez (ventana
+caliente); los demás se cierran y quedan en disco. Dentro de un segmento
+mapeado el sistema operativo decide qué páginas quedan en RAM.
+
+Tiene la misma interfaz que Tape (head, blank, read, write, move, snapshot),
+así que TuringMachine la usa sin cambios.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+
+
+# base imposible: cualquier cabezal queda fuera del segmento y obliga a seleccionar
+_NO_SEGMENT = 1 << 62
+
+
+class MmapTape:
+    def __init__(self, input_str: str, blank: str = "_", directory: str = None,
+                 segment_cells: int = 1 << 24, max_resident: int = 4):
+        if segment_cells % mmap.ALLOCATIONGRANULARITY != 0:
+            raise ValueError(f"segment_cells debe ser múltiplo de {mmap.ALLOCATIONGRANULARITY}")
+        self.blank = blank
+        self.head = 0
+        self.segment_cells = segment_cells
+        self.max_resident = max(1, max_resident)
+
+        self._owns_dir = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="tm_tape_")
+        os.makedirs(self.directory, exist_ok=True)
+        for fname in os.listdir(self.directory):
+            if fname.startswith("seg_") and fname.endswith(".bin"):
+                os.remove(os.path.join(self.directory, fname))
+
+        # el blank es el byte 0, así un archivo recién creado es todo blank
+        self._syms: list[str] = [blank]
+        self._codes: dict[str, int] = {blank: 0}
+
+        # segmentos mapeados: índice -> mmap, en orden de uso (LRU)
+        self._resident: OrderedDict[int, mmap.mmap] = OrderedDict()
+        # segmento bajo el cabezal (None si todavía no existe en disco)
+        self._cur_idx = 0
+        self._cur_base = 0
+        self._cur: mmap.mmap | None = None
+
+        self._load_input(input_str)
+        self._select(0)
+
+    # ---------------------------------------------------------------
+    # Manejo de segmentos
+    # ---------------------------------------------------------------
+
+    def _path(self, idx: int) -> str:
+        return os.path.join(self.directory, f"seg_{idx}.bin")
+
+    def _code(self, sym: str) -> int:
+        c = self._codes.get(sym)
+        if c is None:
+            c = len(self._syms)
+            if c > 255:
+                raise ValueError("MmapTape soporta a lo sumo 256 símbolos")
+            self._syms.append(sym)
+            self._codes[sym] = c
+        return c
+
+    def _segment(self, idx: int, create: bool) -> mmap.mmap | None:
+        mm = self._resident.get(idx)
+        if mm is not None:
+            self._resident.move_to_end(idx)
+            return mm
+        path = self._path(idx)
+        if not os.path.exists(path):
+            if not create:
+                return None
+            with open(path, "wb") as f:
+                f.truncate(self.segment_cells)
+        with open(path, "r+b") as f:
+            mm = mmap.mmap(f.fileno(), self.segment_cells)
+        self._resident[idx] = mm
+        while len(self._resident) > self.max_resident:
+            old_idx, old = self._resident.popitem(last=False)
+            if old is self._cur:
+                # fuerza a read/write a volver a seleccionar el segmento
+                self._cur = None
+                self._cur_base = _NO_SEGMENT
+            old.close()
+        return mm
+
+    def _select(self, idx: int, create: bool = False) -> None:
+        # _segment puede descartar el segmento actual y anular _cur_base,
+        # así que la base se asigna después
+        mm = self._segment(idx, create)
+        self._cur_idx = idx
+        self._cur_base = idx * self.segment_cells
+        self._cur = mm
+
+    def _load_input(self, input_str: str) -> None:
+        # se escribe por bloques, un slice por segmento
+        table = {ord(ch): self._code(ch) for ch in set(input_str)}
+        data = input_str.translate(table).encode("latin-1")
+        pos = 0
+        while pos < len(data):
+            idx, off = divmod(pos, self.segment_cells)
+            chunk = data[pos:pos + self.segment_cells - off]
+            if any(chunk):
+                self._segment(idx, create=True)[off:off + len(chunk)] = chunk
+            pos += len(chunk)
+
+    # ---------------------------------------------------------------
+    # Interfaz de Tape
+    # ---------------------------------------------------------------
+
+    def read(self) -> str:
+        off = self.head - self._cur_base
+        if not 0 <= off < self.segment_cells:
+            self._select(self.head // self.segment_cells)
+            off = self.head - self._cur_base
+        if self._cur is None:
+            return self.blank
+        return self._syms[self._cur[off]]
+
+    def write(self, sym: str) -> None:
+        off = self.head - self._cur_base
+        if not 0 <= off < self.segment_cells or self._cur is None:
+            if sym == self.blank and self._segment(self.head // self.segment_cells, False) is None:
+                return
+            self._select(self.head // self.segment_cells, create=True)
+            off = self.head - self._cur_base
+        self._cur[off] = self._code(sym)
+
+    def move(self, direction: str) -> None:
+        if direction == "L":
+            self.head -= 1
+        elif direction == "R":
+            self.head += 1
+        elif direction == "S":
+            pass
+        else:
+            raise ValueError(f"Movimiento invalido:{direction}")
+
+    def _peek(self, pos: int) -> str:
+        idx, off = divmod(pos, self.segment_cells)
+        mm = self._segment(idx, create=False)
+        if mm is None:
+            return self.blank
+        return self._syms[mm[off]]
+
+    def snapshot(self, window: int = 20) -> str:
+        left = self.head - window
+        s = [self._peek(i) for i in range(left, self.head + window + 1)]
+        # _peek puede haber desalojado el segmento actual
+        self._select(self.head // self.segment_cells)
+        return "".join(s), left
+
+    def _data_ranges(self, mm: mmap.mmap, path: str) -> list[tuple[int, int]]:
+        # los archivos son dispersos: solo se leen las regiones con datos
+        if not hasattr(os, "SEEK_DATA"):
+            return [(0, self.segment_cells)]
+        mm.flush()
+        ranges = []
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            pos = 0
+            while pos < self.segment_cells:
+                try:
+                    lo = os.lseek(fd, pos, os.SEEK_DATA)
+                except OSError:
+                    break
+                hi = min(os.lseek(fd, lo, os.SEEK_HOLE), self.segment_cells)
+                ranges.append((lo, hi))
+                pos = hi
+        finally:
+            os.close(fd)
+        return ranges
+
+    def to_dict(self) -> dict[int, str]:
+        """
+        Contenido no-blanco como pos -> símbolo, igual que Tape.cells.
+        Recorre todos los segmentos en disco, pensado para cintas de prueba.
+        """
+        out: dict[int, str] = {}
+        for fname in os.listdir(self.directory):
+            if not (fname.startswith("seg_") and fname.endswith(".bin")):
+                continue
+            idx = int(fname[4:-4])
+            base = idx * self.segment_cells
+            mm = self._segment(idx, create=False)
+            for lo, hi in self._data_ranges(mm, os.path.join(self.directory, fname)):
+                data = mm[lo:hi]
+                for m in re.finditer(rb"[^\x00]", data):
+                    out[base + lo + m.start()] = self._syms[data[m.start()]]
+        self._select(self.head // self.segment_cells)
+        return out
+
+    def close(self) -> None:
+        for mm in self._resident.values():
+            mm.close()
+        self._resident.clear()
+        self._cur = None
+        if self._owns_dir:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> "MmapTape":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
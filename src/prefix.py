@@ -0,0 +1,191 @@
+"""
+EJECUCIÓN POR LOTES CON PREFIJOS COMPARTIDOS
+Muchas entradas de un barrido comparten prefijos ("1"*n para n consecutivos,
+suites de aceptación parecidas). Mientras el cabezal no lea una celda donde
+las entradas difieren, todas siguen exactamente la misma ejecución, así que
+se simula una sola vez:
+
+- un grupo es una configuración (estado, cabezal, pasos, celdas tocadas) y
+  la lista de entradas que la comparten; las celdas no tocadas se leen de la
+  entrada de cada miembro
+- al leer una celda no tocada, los miembros se separan por el símbolo que
+  tienen ahí (un trie implícito que se recorre solo hasta donde la máquina
+  lee). Si todos coinciden, la celda pasa a las tocadas y no se vuelve a
+  comparar; si no, la configuración se copia una vez por símbolo
+- cada entrada recibe el RunResult exacto de correrla sola
+
+Uso:
+    python -m src.prefix --machine machines/example.json --unary 1 --min-n 0 --max-n 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from .loader import MachineDef, load_machine
+from .machine import RunResult
+from .runner import build_table, TIME_CHECK_EVERY
+from .tape import Tape
+
+
+@dataclass
+class _Group:
+    state: str
+    head: int
+    steps: int
+    touched: Dict[int, str]  # celdas escritas o ya comparadas (puede incluir blanks)
+    members: List[int]       # índices de las entradas que comparten la configuración
+
+
+class BatchRun:
+    def __init__(self, machine: MachineDef, inputs: Sequence[str]):
+        self.m = machine
+        self.inputs = list(inputs)
+        self.results: List[RunResult] = [None] * len(self.inputs)
+        # pasos simulados en total (vs. la suma de result.steps)
+        self.simulated_steps = 0
+        self.forks = 0
+        self._final: List[Tuple[Dict[int, str], int]] = [None] * len(self.inputs)
+
+    def tape(self, i: int) -> Tape:
+        """Cinta final de la entrada i, igual a la de correrla sola."""
+        touched, head = self._final[i]
+        tape = Tape(self.inputs[i], blank=self.m.blank)
+        for pos, sym in touched.items():
+            tape.head = pos
+            tape.write(sym)
+        tape.head = head
+        return tape
+
+    def _finish(self, g: _Group, status: str) -> None:
+        result = RunResult(status, g.steps, g.state)
+        for idx in g.members:
+            self.results[idx] = result
+            self._final[idx] = (g.touched, g.head)
+
+
+def run_batch(machine: MachineDef, inputs: Sequence[str], max_steps: int = 10000,
+              max_time: float = None) -> BatchRun:
+    """
+    Corre todas las entradas compartiendo los prefijos de ejecución.
+    max_time es para el lote completo: al vencer, los grupos pendientes
+    terminan con TIMEOUT_TIME.
+    """
+    batch = BatchRun(machine, inputs)
+    inputs = batch.inputs
+    table = build_table(machine)
+    accept, reject = machine.accept_states, machine.reject_states
+    blank = machine.blank
+    start_time = time.time()
+
+    stack = [_Group(machine.start_state, 0, 0, {}, list(range(len(inputs))))] if inputs else []
+    while stack:
+        g = stack.pop()
+        state, head, steps, touched, members = g.state, g.head, g.steps, g.touched, g.members
+        get = touched.get
+        status = None
+        forked = False
+        start_steps = steps
+        while True:
+            if steps >= max_steps:
+                status = "TIMEOUT_STEPS"
+                break
+            if max_time is not None and time.time() - start_time > max_time:
+                status = "TIMEOUT_TIME"
+                break
+            limit = min(max_steps, steps + TIME_CHECK_EVERY)
+            try:
+                while steps < limit:
+                    row = table.get(state)
+                    if row is None:
+                        break
+                    sym = get(head)
+                    if sym is None:
+                        # celda no tocada: se separa a los miembros por su símbolo
+                        parts: Dict[str, List[int]] = {}
+                        for idx in members:
+                            s = inputs[idx]
+                            c = s[head] if 0 <= head < len(s) else blank
+                            parts.setdefault(c, []).append(idx)
+                        if len(parts) > 1:
+                            items = list(parts.items())
+                            for n, (c, part) in enumerate(items):
+                                # el último grupo se queda con las celdas del padre
+                                t = dict(touched) if n < len(items) - 1 else touched
+                                t[head] = c
+                                stack.append(_Group(state, head, steps, t, part))
+                            batch.forks += 1
+                            forked = True
+                            break
+                        sym = touched[head] = c
+                    t = row.get(sym)
+                    if t is None:
+                        break
+                    write_sym, move, state = t
+                    touched[head] = write_sym
+                    head += move
+                    steps += 1
+                else:
+                    continue
+                break
+            except TypeError:
+                raise ValueError(f"Movimiento invalido:{move}") from None
+
+        batch.simulated_steps += steps - start_steps
+        if forked:
+            continue
+        g.state, g.head, g.steps = state, head, steps
+        if status is not None:
+            batch._finish(g, status)
+            continue
+        if state not in accept and state not in reject:
+            # sin transición: rechazo
+            g.state = next(iter(reject), "qr")
+        if g.state in accept:
+            batch._finish(g, "ACCEPT")
+        elif g.state in reject:
+            batch._finish(g, "REJECT")
+        else:
+            batch._finish(g, "UNKNOWN")
+    return batch
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--machine", required=True, help="Ruta al archivo JSON de la máquina")
+    p.add_argument("--input", action="append", default=[], help="Entrada (se puede repetir)")
+    p.add_argument("--inputs-file", default=None, help="Archivo con una entrada por línea")
+    p.add_argument("--unary", default=None, help="Agregar las entradas símbolo*n para n en [min-n, max-n]")
+    p.add_argument("--min-n", type=int, default=0)
+    p.add_argument("--max-n", type=int, default=20)
+    p.add_argument("--max-steps", type=int, default=10000)
+    p.add_argument("--max-time", type=float, default=None)
+    args = p.parse_args()
+
+    inputs = list(args.input)
+    if args.inputs_file:
+        with open(args.inputs_file, "r", encoding="utf-8") as f:
+            inputs.extend(line.rstrip("\n") for line in f)
+    if args.unary:
+        inputs.extend(args.unary * n for n in range(args.min_n, args.max_n + 1))
+    if not inputs:
+        p.error("no hay entradas (use --input, --inputs-file o --unary)")
+
+    m = load_machine(args.machine)
+    print(f"Machine: {m.name}")
+    t0 = time.perf_counter()
+    batch = run_batch(m, inputs, max_steps=args.max_steps, max_time=args.max_time)
+    elapsed = time.perf_counter() - t0
+    for input_str, result in zip(inputs, batch.results):
+        shown = input_str if len(input_str) <= 30 else input_str[:27] + "..."
+        print(f"{shown!r}: {result.status} | steps={result.steps} | final_state={result.final_state}")
+    total = sum(r.steps for r in batch.results)
+    print(f"BATCH: {len(inputs)} entradas | pasos simulados={batch.simulated_steps} de {total} "
+          f"| bifurcaciones={batch.forks} | {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
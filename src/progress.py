@@ -0,0 +1,171 @@
+"""
+PROGRESO DE CORRIDAS LARGAS
+Reporta, cada `interval` segundos, los pasos ejecutados, pasos/segundo, la
+extensión recorrida por el cabezal (muestreada: solo se ve el cabezal en cada
+poll, así que puede quedar dentro de los extremos reales), el estado actual y
+el tiempo estimado para llegar a max_steps.
+
+Salidas (se pueden combinar):
+- línea de estado en la terminal (stderr), reescrita en su lugar
+- archivo de métricas en formato de exposición de Prometheus
+- callback(ProgressSnapshot)
+
+El motor corre tramos de `check_every` pasos sin revisar nada y llama a
+poll() entre tramos, así el bucle no paga ningún chequeo por paso. Ese número
+se ajusta solo para que el reloj se consulte unas pocas veces por intervalo,
+y si el tiempo gastado reportando supera `budget` (fracción del tiempo total)
+se alarga el intervalo.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class ProgressSnapshot:
+    steps: int
+    elapsed_s: float
+    steps_per_s: float
+    state: str
+    head: int
+    head_min: int      # extensión muestreada (cabezal en cada poll), no exacta
+    head_max: int
+    max_steps: int
+    eta_s: Optional[float]  # None si no hay velocidad medida todavía
+
+
+class ProgressReporter:
+    def __init__(self, interval: float = 1.0, status_line: bool = False, metrics_file: str = None,
+                 callback: Callable[[ProgressSnapshot], None] = None, budget: float = 0.01,
+                 name: str = "", stream=None):
+        self.interval = interval
+        self.status_line = status_line
+        self.metrics_file = metrics_file
+        self.callback = callback
+        self.budget = budget
+        self.name = name
+        self.stream = stream or sys.stderr
+        self.check_every = 4096
+        self.last: ProgressSnapshot = None
+
+    def start(self, max_steps: int, steps: int = 0) -> int:
+        """Inicia la medición; retorna cada cuántos pasos llamar a poll()."""
+        self.max_steps = steps + max_steps
+        self.t0 = self._last_t = time.perf_counter()
+        self._last_steps = steps
+        self._head_min = self._head_max = None
+        self._spent = 0.0
+        self._rate = 0.0
+        return self.check_every
+
+    def poll(self, steps: int, state: str, head: int) -> int:
+        """
+        Lo llama el motor cada check_every pasos. Reporta si ya pasó el
+        intervalo y retorna el nuevo check_every.
+        """
+        self._track_head(head)
+        now = time.perf_counter()
+        dt = now - self._last_t
+        if dt >= self.interval:
+            self._rate = (steps - self._last_steps) / dt
+            self._last_t, self._last_steps = now, steps
+            self._report(steps, state, head, now)
+            # unas 20 consultas al reloj por intervalo, en potencias de 2
+            target = max(1024, min(1 << 22, int(self._rate * self.interval / 20)))
+            self.check_every = 1 << (target.bit_length() - 1)
+        return self.check_every
+
+    def finish(self, steps: int, state: str, head: int) -> ProgressSnapshot:
+        now = time.perf_counter()
+        dt = now - self._last_t
+        if dt > 0 and steps > self._last_steps:
+            self._rate = (steps - self._last_steps) / dt
+        self._track_head(head)
+        snap = self._report(steps, state, head, now)
+        if self.status_line:
+            self.stream.write("\n")
+            self.stream.flush()
+        return snap
+
+    def _track_head(self, head: int) -> None:
+        if self._head_min is None or head < self._head_min:
+            self._head_min = head
+        if self._head_max is None or head > self._head_max:
+            self._head_max = head
+
+    # ---------------------------------------------------------------
+    # Salidas
+    # ---------------------------------------------------------------
+
+    def _report(self, steps: int, state: str, head: int, now: float) -> ProgressSnapshot:
+        elapsed = now - self.t0
+        eta = (self.max_steps - steps) / self._rate if self._rate > 0 else None
+        snap = ProgressSnapshot(steps, elapsed, self._rate, state, head,
+                                self._head_min, self._head_max, self.max_steps, eta)
+        self.last = snap
+        if self.status_line:
+            self._write_status(snap)
+        if self.metrics_file:
+            self._write_metrics(snap)
+        if self.callback is not None:
+            self.callback(snap)
+
+        # presupuesto de overhead: si reportar cuesta demasiado, se reporta menos
+        self._spent += time.perf_counter() - now
+        if elapsed > 0 and self._spent / elapsed > self.budget:
+            self.interval *= 2
+        return snap
+
+    def _write_status(self, s: ProgressSnapshot) -> None:
+        eta = "?" if s.eta_s is None else f"{s.eta_s:,.0f}s"
+        line = (f"\rsteps={s.steps:,} ({s.steps_per_s:,.0f}/s) state={s.state} "
+                f"head={s.head} muestreo=[{s.head_min}, {s.head_max}] elapsed={s.elapsed_s:,.1f}s eta={eta}")
+        self.stream.write(line.ljust(100))
+        self.stream.flush()
+
+    def _write_metrics(self, s: ProgressSnapshot) -> None:
+        labels = f'machine="{_escape(self.name)}"'
+        eta = "NaN" if s.eta_s is None else repr(s.eta_s)
+        lines = [
+            "# HELP tm_steps_total Pasos ejecutados por la máquina.",
+            "# TYPE tm_steps_total counter",
+            f"tm_steps_total{{{labels}}} {s.steps}",
+            "# HELP tm_steps_per_second Pasos por segundo en el último intervalo.",
+            "# TYPE tm_steps_per_second gauge",
+            f"tm_steps_per_second{{{labels}}} {s.steps_per_s!r}",
+            "# HELP tm_elapsed_seconds Segundos desde el inicio de la corrida.",
+            "# TYPE tm_elapsed_seconds gauge",
+            f"tm_elapsed_seconds{{{labels}}} {s.elapsed_s!r}",
+            "# HELP tm_head_position Posición actual del cabezal.",
+            "# TYPE tm_head_position gauge",
+            f"tm_head_position{{{labels}}} {s.head}",
+            "# HELP tm_head_min Posición mínima del cabezal en los muestreos de progreso (no exacta).",
+            "# TYPE tm_head_min gauge",
+            f"tm_head_min{{{labels}}} {s.head_min}",
+            "# HELP tm_head_max Posición máxima del cabezal en los muestreos de progreso (no exacta).",
+            "# TYPE tm_head_max gauge",
+            f"tm_head_max{{{labels}}} {s.head_max}",
+            "# HELP tm_max_steps Límite de pasos de la corrida.",
+            "# TYPE tm_max_steps gauge",
+            f"tm_max_steps{{{labels}}} {s.max_steps}",
+            "# HELP tm_eta_seconds Tiempo estimado para llegar a max_steps.",
+            "# TYPE tm_eta_seconds gauge",
+            f"tm_eta_seconds{{{labels}}} {eta}",
+            "# HELP tm_state Estado actual de la máquina.",
+            "# TYPE tm_state gauge",
+            f'tm_state{{{labels},state="{_escape(s.state)}"}} 1',
+        ]
+        # escritura atómica para que el scraper nunca lea un archivo a medias
+        tmp = f"{self.metrics_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.metrics_file)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
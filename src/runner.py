@@ -0,0 +1,150 @@
+"""
+RUNNER REUTILIZABLE
+Para millones de corridas cortas (barridos, servidor) el costo está en
+preparar cada corrida (crear Tape y TuringMachine, cargar la entrada) más que
+en simular. Runner se construye una vez por máquina y se reutiliza:
+
+- la tabla se reorganiza como table[state][read] -> (write, desplazamiento, next),
+  sin estados de aceptación/rechazo, así cada paso es una consulta por nivel y
+  no se arma la tupla (state, read) como en TuringMachine.step
+- reset(input) recarga la misma Tape en bloque (str, bytes o memoryview)
+- el bucle no crea objetos por paso; el reloj (max_time) y el progreso se
+  revisan entre tramos de pasos, no en cada paso
+
+Misma semántica que TuringMachine.run(trace=False), así que el RunResult y la
+cinta final son idénticos.
+
+Uso:
+    runner = Runner(load_machine("machines/fibonacci.json"))
+    for n in range(20):
+        result = runner.run_input("1" * n, max_steps=10000)
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Tuple
+
+from .loader import MachineDef
+from .machine import RunResult
+from .progress import ProgressReporter
+from .tape import Tape
+
+# desplazamiento del cabezal por movimiento; un movimiento desconocido se deja
+# como string y produce el mismo ValueError que Tape.move al ejecutarse
+_MOVES = {"L": -1, "R": 1, "S": 0}
+
+# cada cuántos pasos se revisa max_time (igual que TuringMachine)
+TIME_CHECK_EVERY = 100000
+
+
+def build_table(m: MachineDef) -> Dict[str, Dict[str, Tuple[str, int, str]]]:
+    halting = set(m.accept_states) | set(m.reject_states)
+    table: Dict[str, Dict[str, Tuple[str, int, str]]] = {}
+    for (state, read), (write, move, nxt) in m.delta.items():
+        if state not in halting:
+            table.setdefault(state, {})[read] = (write, _MOVES.get(move, move), nxt)
+    return table
+
+
+class Runner:
+    def __init__(self, machine: MachineDef, tape: Tape = None):
+        self.m = machine
+        self.table = build_table(machine)
+        self.tape = tape if tape is not None else Tape("", blank=machine.blank)
+        self.state = machine.start_state
+        self.steps = 0
+
+    def reset(self, input_data) -> None:
+        self.tape.reset(input_data)
+        self.state = self.m.start_state
+        self.steps = 0
+
+    def run_input(self, input_data, max_steps: int = 10000, max_time: float = None) -> RunResult:
+        self.reset(input_data)
+        return self.run(max_steps=max_steps, max_time=max_time)
+
+    def run(self, max_steps: int = 10000, trace: bool = False, window: int = 20, max_time: float = None,
+            progress: ProgressReporter = None) -> RunResult:
+        if trace:
+            raise ValueError("Runner no soporta trace, use TuringMachine")
+        if progress is not None:
+            progress.start(max_steps, self.steps)
+        status = self._run(max_steps, max_time, progress)
+        if progress is not None:
+            progress.finish(self.steps, self.state, self.tape.head)
+        if status is not None:
+            return RunResult(status, self.steps, self.state)
+        if self.state in self.m.accept_states:
+            return RunResult("ACCEPT", self.steps, self.state)
+        if self.state in self.m.reject_states:
+            return RunResult("REJECT", self.steps, self.state)
+        return RunResult("UNKNOWN", self.steps, self.state)
+
+    def _run(self, max_steps: int, max_time: float = None, progress: ProgressReporter = None) -> str:
+        # retorna el estado de timeout, o None si la máquina se detuvo
+        table = self.table
+        tape = self.tape
+        cells = tape.cells
+        get = cells.get
+        pop = cells.pop
+        blank = tape.blank
+        state = self.state
+        head = tape.head
+        base = self.steps
+
+        start_time = time.time()
+        next_time = 0 if max_time is not None else max_steps
+        next_poll = 0 if progress is not None else max_steps
+        i = j = 0
+        status = None
+        stopped = False
+        try:
+            while i < max_steps:
+                if i == next_time:
+                    if time.time() - start_time > max_time:
+                        status = "TIMEOUT_TIME"
+                        break
+                    next_time += TIME_CHECK_EVERY
+                if i == next_poll:
+                    next_poll += progress.poll(base + i, state, head)
+                end = min(max_steps, next_time, next_poll)
+
+                for j in range(i, end):
+                    row = table.get(state)
+                    if row is None:
+                        stopped = True
+                        break
+                    t = row.get(get(head, blank))
+                    if t is None:
+                        stopped = True
+                        break
+                    write_sym, move, state = t
+                    if write_sym == blank:
+                        pop(head, None)
+                    else:
+                        cells[head] = write_sym
+                    head += move
+                if stopped:
+                    i = j
+                    break
+                i = end
+            else:
+                status = "TIMEOUT_STEPS"
+        except TypeError:
+            # movimiento inválido (quedó como string en la tabla): el símbolo
+            # ya se escribió, el paso no cuenta y el estado sigue siendo el de
+            # antes de la transición, igual que TuringMachine.step. `state` ya
+            # se sobrescribió, así que se recupera buscando la fila de t (cada
+            # entrada de la tabla es una tupla distinta); no cuesta nada por paso
+            self.steps, tape.head = base + j, head
+            self.state = next(s for s, row in table.items() if any(v is t for v in row.values()))
+            raise ValueError(f"Movimiento invalido:{move}") from None
+
+        self.steps = base + i
+        tape.head = head
+        self.state = state
+        if stopped and state not in self.m.accept_states and state not in self.m.reject_states:
+            # sin transición: rechazo
+            self.state = next(iter(self.m.reject_states), "qr")
+        return status
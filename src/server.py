@@ -0,0 +1,158 @@
+"""
+SERVIDOR DE SIMULACIÓN
+Mantiene las máquinas cargadas en memoria y atiende peticiones de ejecución
+por HTTP en localhost, para no pagar en cada corrida el arranque del
+intérprete, el parseo del JSON y la construcción de delta.
+
+Cada petición se ejecuta en un pool de procesos. Cada proceso del pool guarda
+su propia caché de Runner (por ruta y fecha de modificación), así la máquina
+se carga una vez por proceso, no se serializa en cada petición y la cinta se
+reutiliza entre corridas.
+
+Uso:
+    python -m src.server --port 8765 --workers 4 --preload machines/fibonacci.json
+
+Petición (POST /run):
+    {"machine": "machines/fibonacci.json", "input": "11111", "max_steps": 10000}
+Respuesta:
+    {"status": "ACCEPT", "steps": 310, "final_state": "qa"}
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .loader import load_machine
+from .runner import Runner
+
+# caché del proceso trabajador: ruta absoluta -> (mtime_ns, Runner)
+_machines: dict[str, tuple[int, Runner]] = {}
+
+
+def _get_machine(path: str) -> Runner:
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _machines.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    runner = Runner(load_machine(path))
+    _machines[path] = (mtime, runner)
+    return runner
+
+
+def _preload(paths: list[str]) -> None:
+    for path in paths:
+        _get_machine(path)
+
+
+def _parse_request(req) -> tuple:
+    # valida tipos antes de mandar el trabajo al pool
+    if not isinstance(req, dict):
+        raise ValueError("el cuerpo debe ser un objeto JSON")
+    machine = req.get("machine")
+    input_str = req.get("input", "")
+    max_steps = req.get("max_steps", 10000)
+    max_time = req.get("max_time")
+    if not isinstance(machine, str):
+        raise ValueError("'machine' debe ser la ruta de la máquina (string)")
+    if not isinstance(input_str, str):
+        raise ValueError("'input' debe ser un string")
+    if isinstance(max_steps, bool) or not isinstance(max_steps, int) or max_steps < 0:
+        raise ValueError("'max_steps' debe ser un entero no negativo")
+    if max_time is not None and (isinstance(max_time, bool) or not isinstance(max_time, (int, float)) or max_time < 0):
+        raise ValueError("'max_time' debe ser un número no negativo o null")
+    return machine, input_str, max_steps, max_time
+
+
+def _run_job(machine_path: str, input_str: str, max_steps: int, max_time: float = None) -> dict:
+    # cada proceso atiende una corrida a la vez, así el Runner se reutiliza
+    result = _get_machine(machine_path).run_input(input_str, max_steps=max_steps, max_time=max_time)
+    return asdict(result)
+
+
+class SimulationServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, pool: ProcessPoolExecutor):
+        super().__init__(address, _Handler)
+        self.pool = pool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: SimulationServer
+
+    def _send_json(self, code: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"ok": True})
+        else:
+            self._send_json(404, {"error": f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/run":
+            self._send_json(404, {"error": f"Ruta desconocida: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            req = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.pool.submit(_run_job, *_parse_request(req))
+            self._send_json(200, job.result())
+        except (KeyError, ValueError, OSError) as e:
+            # petición inválida, máquina inexistente o mal definida
+            self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            # cualquier otro error del trabajador: el cliente igual recibe JSON
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        # sin log por petición: miles de corridas pequeñas llenarían la consola
+        pass
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--preload", nargs="*", default=[], help="Máquinas JSON a cargar al iniciar cada trabajador")
+    args = p.parse_args()
+
+    # SIGTERM termina igual que Ctrl-C: se cierra el socket y se espera al pool
+    signal.signal(signal.SIGTERM, _terminate)
+
+    # con "spawn" los trabajadores no heredan descriptores del proceso
+    # principal; además se arrancan antes de abrir el puerto, así ningún
+    # trabajador (ni uno huérfano) queda con el socket
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx,
+                             initializer=_preload, initargs=(args.preload,)) as pool:
+        for job in [pool.submit(os.getpid) for _ in range(args.workers)]:
+            job.result()
+        server = SimulationServer((args.host, args.port), pool)
+        print(f"Servidor de simulación en http://{args.host}:{args.port} ({args.workers} trabajadores)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+def _terminate(signum, frame):
+    raise KeyboardInterrupt
+
+
+if __name__ == "__main__":
+    main()
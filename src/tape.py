@@ -16,9 +16,25 @@ class Tape:
         self.blank = blank
         self.head = 0
         self.cells: dict[int, str] = {}
-        for i , ch in enumerate(input_str):
-            if ch != blank:
-                self.cells[i] = ch
+        self.reset(input_str)
+
+    # vuelve a cargar una entrada reutilizando el mismo objeto; acepta str o
+    # bytes/bytearray/memoryview (1 byte por símbolo, latin-1). Se reutilizan
+    # el objeto y el dict, no su tabla: clear() la libera y update() arma una
+    # nueva. Sobrescribir las claves y borrar solo las sobrantes resultó más
+    # lento (recorrer y borrar cuesta más que la tabla nueva)
+    def reset(self, input_data) -> None:
+        if not isinstance(input_data, str):
+            input_data = str(input_data, "latin-1")
+        self.head = 0
+        cells = self.cells
+        cells.clear()
+        # carga en bloque; los blanks de la entrada se quitan después
+        cells.update(enumerate(input_data))
+        if self.blank in input_data:
+            for i, ch in enumerate(input_data):
+                if ch == self.blank:
+                    del cells[i]
 
     # devolver el simbolo donde está el cabezal, si no existe en cells devuelve blank
     def read(self) -> str:
@@ -44,6 +60,10 @@ class Tape:
         else:
             raise ValueError(f"Movimiento invalido:{direction}")
         
+    # contenido no-blanco como diccionario pos -> símbolo (para comparar cintas)
+    def to_dict(self) -> dict[int, str]:
+        return dict(self.cells)
+
     # vista parcial de la cinta para imprimir en el trace
     def snapshot(self, window: int = 20) -> str:
         left = self.head - window